@@ -8,6 +8,8 @@ from flask import (
     redirect,
     url_for,
     flash,
+    Response,
+    stream_with_context,
 )
 from flask_login import (
     LoginManager,
@@ -16,12 +18,17 @@ from flask_login import (
     login_required,
     current_user,
 )
-from datetime import date, datetime, timedelta
+from datetime import date, datetime, timedelta, timezone
 import itertools
 import io
 import csv
+import json
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
 import requests
 import os
+import threading
+import time
 from database import (
     db,
     User,
@@ -34,7 +41,26 @@ from database import (
     CompanySettings,
     CompanyEmployee,
 )
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
 from config import Config
+from holiday_cache import HolidayCache
+from holiday_rules import chile_holidays
+from suggestion_cache import SuggestionCache, suggest_fingerprint
+from vacation_planner import optimal_plan
+from suggestion_engine import (
+    DayFeatures,
+    SuggestionContext,
+    classic_suggestions,
+    deadline_suggestions,
+    estimate_suggest_cost,
+    has_vectorized,
+    parallel_suggestions,
+    pattern_period,
+    resolve_strategies,
+    stream_suggestions,
+    vectorized_suggestions,
+)
 
 app = Flask(__name__)
 app.config.from_object(Config)
@@ -361,33 +387,99 @@ def get_holidays_from_api(year: int) -> list[dict]:
         return []
 
 
-def get_holidays_for_year(year: int) -> list[dict]:
-    """Retorna los feriados para un año específico"""
+def load_stored_holidays(year: int):
+    """Feriados de la API guardados en la tabla holidays y su fecha de carga"""
+    if not check_db_available():
+        return None
+    with app.app_context():
+        rows = Holiday.query.filter_by(year=year, source="api").order_by(Holiday.date).all()
+    if not rows:
+        return None
+    updated_at = min(r.updated_at for r in rows).replace(tzinfo=timezone.utc)
+    holidays = [
+        {
+            "date": df(r.date),
+            "name": r.name,
+            "irrenunciable": r.is_irrenunciable,
+            "scope": r.scope,
+        }
+        for r in rows
+    ]
+    return holidays, updated_at.timestamp()
+
+
+def store_holidays(year: int, holidays: list[dict]) -> None:
+    """Reemplaza los feriados de la API guardados del año (uno por fecha, por la restricción única)"""
+    if not check_db_available():
+        return
+    rows = {}
+    for h in holidays:
+        rows.setdefault(
+            h["date"],
+            {
+                "year": year,
+                "date": parse_iso(h["date"]),
+                "name": h["name"],
+                "is_irrenunciable": bool(h["irrenunciable"]),
+                "scope": h["scope"],
+                "source": "api",
+                "updated_at": datetime.utcnow(),
+            },
+        )
+    with app.app_context():
+        try:
+            # Solo se reemplaza lo descargado: las filas cargadas a mano
+            # (otro source) se conservan y sus fechas no se insertan
+            Holiday.query.filter_by(year=year, source="api").delete()
+            kept = {
+                d.isoformat()
+                for (d,) in db.session.query(Holiday.date).filter_by(year=year)
+            }
+            values = [row for iso, row in rows.items() if iso not in kept]
+            if values:
+                db.session.execute(insert(Holiday), values)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+
+# Feriados de la API (años >= 2027): memoria, tabla holidays y descarga en
+# segundo plano, sin que los requests esperen a la red
+holiday_cache = HolidayCache(
+    get_holidays_from_api,
+    load_stored_holidays,
+    store_holidays,
+    app.config["HOLIDAY_CACHE_TTL"],
+    app.config["HOLIDAY_NEGATIVE_TTL"],
+)
+
+
+def fetch_year_holidays(year: int) -> tuple[list[dict], str]:
+    """
+    Feriados de un año y su origen: "local", "api" o "local-fallback" (la
+    API aún no respondió o falló). Nunca espera a la red. Para un mismo año
+    devuelve la misma lista mientras no cambie, así los índices la reconocen.
+    """
     if year == 2025:
-        return HOLIDAYS_2025
+        return HOLIDAYS_2025, "local"
     elif year == 2026:
-        return HOLIDAYS_2026
+        return HOLIDAYS_2026, "local"
     elif year >= 2027:
-        # Para años futuros, intentar obtener desde API
-        api_holidays = get_holidays_from_api(year)
+        # Para años futuros, lo descargado de la API (si ya está)
+        api_holidays = holiday_cache.get(year)
         if api_holidays:
-            return api_holidays
-        else:
-            # Fallback: usar 2026 como base y ajustar fechas
-            holidays = []
-            for h in HOLIDAYS_2026:
-                h_copy = h.copy()
-                h_copy["date"] = h_copy["date"].replace("2026", str(year))
-                holidays.append(h_copy)
-            return holidays
+            return api_holidays, "api"
+        # Fallback: feriados calculados por reglas (Pascua, solsticio, traslados)
+        return chile_holidays(year), "local-fallback"
     else:
-        # Para años pasados, usar 2025 como base
-        holidays = []
-        for h in HOLIDAYS_2025:
-            h_copy = h.copy()
-            h_copy["date"] = h_copy["date"].replace("2025", str(year))
-            holidays.append(h_copy)
-        return holidays
+        # Para años pasados, feriados calculados por reglas
+        return chile_holidays(year), "local"
+
+
+def get_holidays_for_year(year: int) -> list[dict]:
+    """Retorna los feriados para un año específico"""
+    return fetch_year_holidays(year)[0]
 
 
 def parse_iso(d: str) -> date:
@@ -421,23 +513,107 @@ def in_scope(h: dict, scope_sel: str) -> bool:
     return True
 
 
+class HolidayIndex:
+    """
+    Feriados de un año ya filtrados por alcance: fechas ISO ordenadas, sus
+    ordinales (para buscar rangos por bisección) y fecha -> feriados.
+    """
+
+    def __init__(self, holidays: list[dict], scope_sel: str):
+        self.source = holidays
+        by_date: dict[str, list[dict]] = {}
+        for h in holidays:
+            if in_scope(h, scope_sel):
+                by_date.setdefault(h["date"], []).append(h)
+        self.by_date = by_date
+        self.dates = sorted(by_date)  # El orden ISO es el cronológico
+        self.ordinals = [parse_iso(d).toordinal() for d in self.dates]
+
+    def between(self, s: date, e: date) -> list[str]:
+        """Fechas con feriado en [s, e]"""
+        lo = bisect_left(self.ordinals, s.toordinal())
+        hi = bisect_right(self.ordinals, e.toordinal())
+        return self.dates[lo:hi]
+
+
+# Índices por (año, alcance) compartidos por todos los requests del proceso
+_holiday_indexes: dict[tuple[int, str], HolidayIndex] = {}
+
+
+def holiday_index(year: int, scope_sel: str) -> HolidayIndex:
+    """Índice del año y alcance; se rearma solo si cambia la lista del año"""
+    holidays, _ = fetch_year_holidays(year)
+    key = (year, scope_sel)
+    index = _holiday_indexes.get(key)
+    if index is None or index.source is not holidays:
+        index = HolidayIndex(holidays, scope_sel)
+        _holiday_indexes[key] = index
+    return index
+
+
 def holidays_by_date(start: str, end: str, scope_sel: str) -> dict[str, list[dict]]:
     s, e = parse_iso(start), parse_iso(end)
     out: dict[str, list[dict]] = {}
 
-    # Obtener feriados para todos los años en el rango
-    years = set(range(s.year, e.year + 1))
-    all_holidays = []
-    for year in years:
-        all_holidays.extend(get_holidays_for_year(year))
-
-    for h in all_holidays:
-        dh = parse_iso(h["date"])
-        if s <= dh <= e and in_scope(h, scope_sel):
-            out.setdefault(h["date"], []).append(h)
+    # Feriados de cada año del rango, por bisección sobre su índice; las
+    # listas se comparten entre requests y no se deben modificar
+    for year in range(s.year, e.year + 1):
+        index = holiday_index(year, scope_sel)
+        for iso in index.between(s, e):
+            out[iso] = index.by_date[iso]
     return out  # "YYYY-MM-DD" -> [feriados]
 
 
+# ====== PRECARGA DE FERIADOS ======
+# Se marca al terminar la precarga del arranque; /health responde 503 antes
+holidays_ready = threading.Event()
+
+
+def warm_up_holidays(
+    first_year: int,
+    last_year: int,
+    scopes: tuple[str, ...] = ("nacional+electoral",),
+    timeout: float = 15.0,
+) -> None:
+    """
+    Carga e indexa los feriados de [first_year, last_year]: desde la tabla
+    holidays si hay filas, si no por reglas locales, y espera las descargas
+    de la API que queden pendientes hasta `timeout` segundos en total.
+    """
+    try:
+        deadline = time.monotonic() + timeout
+        years = range(first_year, last_year + 1)
+        # Primero se piden todos los años: las descargas corren en paralelo
+        for year in years:
+            fetch_year_holidays(year)
+        for year in years:
+            holiday_cache.wait(year, max(0.0, deadline - time.monotonic()))
+        for year in years:
+            for scope in scopes:
+                holiday_index(year, scope)
+    except Exception as e:
+        print(f"Error al precargar feriados: {e}")
+    finally:
+        holidays_ready.set()
+
+
+def start_holiday_warmup() -> None:
+    """Lanza la precarga en un thread de fondo según la configuración"""
+    if not app.config["HOLIDAY_WARMUP"]:
+        holidays_ready.set()
+        return
+    year = date.today().year
+    threading.Thread(
+        target=warm_up_holidays,
+        args=(
+            year - app.config["HOLIDAY_WARMUP_PAST"],
+            year + app.config["HOLIDAY_WARMUP_FUTURE"],
+        ),
+        kwargs={"timeout": app.config["HOLIDAY_WARMUP_TIMEOUT"]},
+        daemon=True,
+    ).start()
+
+
 def expand_pattern(pat: str) -> list[str]:
     """Expande el patrón de turnos en una lista"""
     if not pat or not pat.strip():
@@ -459,6 +635,127 @@ def expand_pattern(pat: str) -> list[str]:
     return pattern_list
 
 
+class CompiledPattern:
+    """
+    Patrón de turnos expandido con su largo de ciclo y conteos por turno.
+
+    `prefix[kind][i]` cuenta ese turno en las primeras i posiciones de dos
+    ciclos seguidos, así que los turnos de cualquier tramo de días se
+    cuentan en O(1) con ciclos completos más el resto.
+    """
+
+    def __init__(self, pattern_str: str):
+        self.kinds = expand_pattern(pattern_str) or ["L"]
+        self.length = len(self.kinds)
+        self.prefix = {}
+        for kind in ("L", "D", "N"):
+            acc = [0]
+            for k in self.kinds + self.kinds:
+                acc.append(acc[-1] + (k == kind))
+            self.prefix[kind] = acc
+
+    def kind_at(self, offset: int) -> str:
+        return self.kinds[offset % self.length]
+
+    def sequence(self, offset: int, n: int) -> list[str]:
+        """Turnos de n días seguidos empezando en la fase `offset`"""
+        offset %= self.length
+        return list(itertools.islice(itertools.cycle(self.kinds), offset, offset + n))
+
+    def counts(self, offset: int, n: int) -> dict[str, int]:
+        """Conteo de L/D/N en n días seguidos desde la fase `offset`, en O(1)"""
+        offset %= self.length
+        full, rest = divmod(max(0, n), self.length)
+        return {
+            kind: full * acc[self.length] + acc[offset + rest] - acc[offset]
+            for kind, acc in self.prefix.items()
+        }
+
+
+@lru_cache(maxsize=256)
+def compile_pattern(pattern_str: str) -> CompiledPattern:
+    return CompiledPattern(pattern_str)
+
+
+def override_positions(s: date, n: int, overrides: dict[str, str] | None):
+    """(índice del día, turno) de los overrides con fecha ISO exacta en el rango"""
+    for iso, kind in (overrides or {}).items():
+        try:
+            k = (parse_iso(iso) - s).days
+        except (TypeError, ValueError):
+            continue
+        if 0 <= k < n and df(s + timedelta(days=k)) == iso:
+            yield k, kind
+
+
+def schedule_kinds(
+    start: str,
+    end: str,
+    pattern_start: str,
+    pattern_str: str,
+    overrides: dict[str, str] | None = None,
+) -> list[str]:
+    """
+    Turnos del rango [start, end], uno por día, sin armar fechas: el ciclo
+    del patrón desde la fase que le corresponde a `start` más los overrides.
+    """
+    pat = compile_pattern(pattern_str)  # e.g. ["D","D","L","L","N","N"]
+    s, e = parse_iso(start), parse_iso(end)
+
+    # Validar que las fechas sean válidas
+    if s > e:
+        return []
+
+    # Turnos de todo el rango de una vez (cálculo hacia adelante desde el
+    # inicio del patrón)
+    n = (e - s).days + 1
+    kinds = pat.sequence((s - parse_iso(pattern_start)).days, n)
+
+    # Aplicar overrides en una pasada sobre sus claves (solo fechas ISO exactas)
+    for k, kind in override_positions(s, n, overrides):
+        kinds[k] = kind
+
+    return kinds
+
+
+def schedule_summary(
+    start: str,
+    end: str,
+    pattern_start: str,
+    pattern_str: str,
+    overrides: dict[str, str] | None,
+    hols: dict[str, list[dict]],
+) -> dict[str, int]:
+    """
+    Resumen de /api/build sin recorrer los días: L/D/N por ciclos completos
+    más el resto, corregidos por los overrides, y H/Irr/Loc desde los
+    feriados del rango.
+    """
+    s, e = parse_iso(start), parse_iso(end)
+    n = max(0, (e - s).days + 1)
+    pat = compile_pattern(pattern_str)
+    offset = (s - parse_iso(pattern_start)).days if n else 0
+    counts = pat.counts(offset, n)
+    for k, kind in override_positions(s, n, overrides):
+        base = pat.kind_at(offset + k)
+        counts[base] -= 1
+        if kind in counts:
+            counts[kind] += 1
+
+    # Los feriados ya vienen filtrados al rango: un día con feriado por clave
+    counts["H"] = len(hols)
+    counts["Irr"] = sum(1 for hs in hols.values() if any(h["irrenunciable"] for h in hs))
+    counts["Loc"] = sum(
+        1
+        for hs in hols.values()
+        if any(
+            h["scope"].startswith("regional") or h["scope"].startswith("local")
+            for h in hs
+        )
+    )
+    return counts
+
+
 def build_schedule(
     start: str,
     end: str,
@@ -472,41 +769,53 @@ def build_schedule(
     Args:
         start: Fecha de inicio del rango a mostrar (también inicio del patrón)
         end: Fecha de fin del rango a mostrar
-        pattern_start: Fecha de inicio del patrón de turnos (usado solo para compatibilidad)
+        pattern_start: Fecha de inicio del patrón de turnos (define la fase del ciclo)
         pattern_str: Patrón de turnos (ej: "D,D,L,L,N,N")
 
     Returns:
         Lista de días con sus turnos asignados
     """
-    pat = expand_pattern(pattern_str)  # e.g. ["D","D","L","L","N","N"]
-    if not pat:
-        pat = ["L"]
+    kinds = schedule_kinds(start, end, pattern_start, pattern_str, overrides)
+    return encode_schedule(start, kinds, "days")  # L | D | N
 
-    s, e = parse_iso(start), parse_iso(end)
-    days = []
 
-    # Validar que las fechas sean válidas
-    if s > e:
-        return days
+# Formatos de calendario de /api/build
+SCHEDULE_FORMATS = ("days", "columnar", "rle")
 
-    # Para cada día en el rango de visualización
-    for d in daterange(s, e):
-        # Calcular cuántos días han pasado desde el inicio del patrón
-        pattern_start_date = parse_iso(pattern_start)
-        days_since_pattern_start = (d - pattern_start_date).days
 
-        # Cálculo hacia adelante desde el inicio del patrón
-        pat_idx = days_since_pattern_start % len(pat)
-        kind = pat[pat_idx]
+def encode_schedule(start: str, kinds: list[str], fmt: str):
+    """
+    Calendario de /api/build en el formato pedido: "days" (un objeto por día),
+    "columnar" (fecha de inicio y un turno por día) o "rle" (tramos
+    [turno, días]). Los turnos van como string si todos son de un carácter.
+    """
+    if fmt == "days":
+        first = parse_iso(start).toordinal()
+        isos = map(date.isoformat, map(date.fromordinal, range(first, first + len(kinds))))
+        return [{"date": iso, "kind": kind} for iso, kind in zip(isos, kinds)]
+    if fmt == "columnar":
+        packed = "".join(kinds)
+        return {
+            "format": "columnar",
+            "start": df(parse_iso(start)),
+            "kinds": packed if len(packed) == len(kinds) else kinds,
+        }
+    return {
+        "format": "rle",
+        "start": df(parse_iso(start)),
+        "runs": [[kind, sum(1 for _ in run)] for kind, run in itertools.groupby(kinds)],
+    }
 
-        # Aplicar override si existe
-        iso = df(d)
-        if overrides and iso in overrides:
-            kind = overrides[iso]  # aplicar override si existe
 
-        days.append({"date": iso, "kind": kind})  # L | D | N
+# Motores disponibles para /api/suggest
+SUGGEST_ENGINES = ("classic", "vectorized", "parallel")
 
-    return days
+# Cache de sugerencias compartido por todos los requests del proceso
+suggestion_cache = SuggestionCache(
+    app.config["SUGGEST_CACHE_SIZE"],
+    app.config["SUGGEST_CACHE_TTL"],
+    app.config["SUGGEST_CACHE_DB"],
+)
 
 
 def is_weekend(d: date) -> bool:
@@ -559,7 +868,7 @@ def dashboard():
 def index():
     """Página principal - requiere autenticación"""
     try:
-    return render_template("index.html")
+        return render_template("index.html")
     except Exception as e:
         return f"Error al cargar la aplicación: {str(e)}", 500
 
@@ -574,42 +883,212 @@ def api_build():
     overrides = data.get("overrides") or {}  # NUEVO
     scope = "nacional+electoral"  # Siempre incluir feriados nacionales y electorales
     weekend = "si"  # Siempre contar fines de semana como libres
+    # "days" (un objeto por día), "columnar" o "rle" (compactos)
+    fmt = data.get("format", "days")
+    if fmt not in SCHEDULE_FORMATS:
+        return jsonify({"error": f"Formato de calendario inválido: {fmt}"}), 400
 
-    sched = build_schedule(start, end, pattern_start, pattern, overrides=overrides)
+    kinds = schedule_kinds(start, end, pattern_start, pattern, overrides=overrides)
     hols = holidays_by_date(start, end, scope)
 
-    # resumen
-    L = D = N = H = Irr = Loc = 0
-    for d in sched:
-        if d["kind"] == "L":
-            L += 1
-        elif d["kind"] == "D":
-            D += 1
-        elif d["kind"] == "N":
-            N += 1
-        hs = hols.get(d["date"], [])
-        if hs:
-            H += 1
-            if any(h["irrenunciable"] for h in hs):
-                Irr += 1
-            if any(
-                h["scope"].startswith("regional") or h["scope"].startswith("local")
-                for h in hs
-            ):
-                Loc += 1
-
     return jsonify(
         {
-        "schedule": sched,
+        "schedule": encode_schedule(start, kinds, fmt),
         "holidays": hols,
-        "summary": {"L": L, "D": D, "N": N, "H": H, "Irr": Irr, "Loc": Loc},
+        "summary": schedule_summary(
+            start, end, pattern_start, pattern, overrides, hols
+        ),
         "useWeekend": weekend == "si",
         }
     )
 
 
+def suggest_cache_key(
+    start,
+    end,
+    pattern_start,
+    pattern,
+    overrides,
+    vac_budget,
+    vacation_calculation,
+    min_win,
+    max_win,
+    strategies,
+    hols,
+) -> str:
+    """
+    Huella normalizada de un request de sugerencias: el resultado no depende
+    del motor, y dos patrones iguales con la misma fase en `start` producen
+    el mismo calendario.
+    """
+    pat = expand_pattern(pattern)
+    return suggest_fingerprint(
+        {
+            "start": start,
+            "end": end,
+            "pattern": ",".join(pat),
+            "phase": (parse_iso(start) - parse_iso(pattern_start)).days % len(pat),
+            "overrides": {k: v for k, v in overrides.items() if start <= k <= end},
+            "vacBudget": vac_budget,
+            "vacationCalculation": vacation_calculation,
+            "minWin": min_win,
+            "maxWin": max_win,
+            "strategies": [s.name for s in strategies],
+        },
+        hols,
+    )
+
+
+def stored_suggestions(user_id: int, fingerprint: str) -> list[dict] | None:
+    """Sugerencias guardadas del usuario para la misma huella, en orden de ranking"""
+    try:
+        rows = (
+            AISuggestion.query.filter_by(user_id=user_id, fingerprint=fingerprint)
+            .order_by(AISuggestion.rank)
+            .all()
+        )
+    except Exception as e:
+        # La sesión queda en una transacción fallida hasta el rollback
+        db.session.rollback()
+        print(f"Error al leer sugerencias guardadas: {e}")
+        return None
+    if not rows:
+        return None
+    # Tablas sin el índice único pueden tener el ranking repetido
+    by_rank = {}
+    for row in rows:
+        by_rank.setdefault(row.rank, row)
+    rows = list(by_rank.values())
+    return [
+        {
+            "start": df(row.start_date),
+            "end": df(row.end_date),
+            "len": row.window_length,
+            "used": row.work_days,
+            "holCount": row.holidays_included,
+            "irrCount": row.irr_count,
+            "score": row.score,
+            "strategy": row.strategy,
+            "ai_reason": row.ai_reason,
+        }
+        for row in rows
+    ]
+
+
+def save_suggestions(user_id: int, fingerprint: str, suggestions: list[dict]) -> None:
+    """Guarda el top del usuario en ai_suggestions con un solo INSERT"""
+    if not suggestions:
+        return
+    try:
+        db.session.execute(
+            insert(AISuggestion),
+            [
+                {
+                    "user_id": user_id,
+                    "fingerprint": fingerprint,
+                    "rank": rank,
+                    "start_date": parse_iso(s["start"]),
+                    "end_date": parse_iso(s["end"]),
+                    "window_length": s["len"],
+                    "strategy": s["strategy"],
+                    "score": s["score"],
+                    "work_days": s["used"],
+                    "holidays_included": s["holCount"],
+                    "irr_count": s["irrCount"],
+                    "ai_reason": s["ai_reason"],
+                }
+                for rank, s in enumerate(suggestions)
+            ],
+        )
+        db.session.commit()
+    except IntegrityError:
+        # Otro request igual ya las guardó
+        db.session.rollback()
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error al guardar sugerencias: {e}")
+
+
+def known_suggestions(user_id: int | None, fingerprint: str):
+    """
+    Sugerencias ya calculadas para la huella: primero el cache en memoria y,
+    si no están, el historial del usuario en la base de datos (que sobrevive
+    a reinicios y deploys). Devuelve (sugerencias o None, si vienen de la base).
+    """
+    cached = suggestion_cache.get(fingerprint)
+    if user_id is None:
+        return cached, False
+    stored = stored_suggestions(user_id, fingerprint)
+    if cached is not None:
+        # El cache es común a todos: si las calculó otro usuario (o este, sin
+        # sesión), igual pasan al historial de este usuario
+        if stored is None:
+            save_suggestions(user_id, fingerprint, cached)
+        return cached, False
+    if stored is None:
+        return None, False
+    suggestion_cache.set(fingerprint, stored)
+    return stored, True
+
+
+def current_user_id() -> int | None:
+    """Id del usuario con sesión, o None si no hay sesión o base de datos"""
+    if check_db_available() and current_user.is_authenticated:
+        return current_user.id
+    return None
+
+
+def suggest_cost(start, end, min_win, max_win, strategies) -> int:
+    """Costo estimado de un request de sugerencias, sin construir el calendario"""
+    days = (parse_iso(end) - parse_iso(start)).days + 1
+    return estimate_suggest_cost(max(0, days), min_win, max_win, strategies)
+
+
+def window_range_error(min_win: int, max_win: int):
+    """Respuesta 400 si minWin/maxWin no forman un rango de largos válido, o None"""
+    if min_win < 1:
+        return jsonify({"error": "minWin debe ser al menos 1"}), 400
+    if min_win > max_win:
+        return jsonify({"error": "minWin no puede ser mayor que maxWin"}), 400
+    return None
+
+
+def admission_route(cost: int, strategies) -> str | None:
+    """
+    Motor que impone el control de admisión según el costo estimado: None
+    bajo SUGGEST_COST_SOFT_LIMIT; sobre él "vectorized" (resultado completo
+    en una fracción del tiempo del clásico) mientras el costo no pase
+    SUGGEST_COST_VECTOR_LIMIT, cuya memoria crece con las ventanas, y
+    "deadline" (modo con plazo) más allá o si alguna estrategia no tiene
+    versión vectorizada
+    """
+    if cost <= app.config["SUGGEST_COST_SOFT_LIMIT"]:
+        return None
+    if cost <= app.config["SUGGEST_COST_VECTOR_LIMIT"] and has_vectorized(strategies):
+        return "vectorized"
+    return "deadline"
+
+
+def cost_rejected(cost: int):
+    """Respuesta para requests sobre SUGGEST_COST_HARD_LIMIT"""
+    limit = app.config["SUGGEST_COST_HARD_LIMIT"]
+    return (
+        jsonify(
+            {
+                "error": f"Solicitud demasiado costosa (costo estimado {cost}, "
+                f"máximo {limit}): reduzca el rango de fechas o maxWin",
+                "cost": cost,
+                "maxCost": limit,
+            }
+        ),
+        422,
+        {"X-Suggest-Cost": str(cost)},
+    )
+
+
 @app.post("/api/suggest")
 def api_suggest():
+    received = time.perf_counter()
     data = request.get_json(force=True)
     start = data["start"]
     end = data["end"]
@@ -624,619 +1103,343 @@ def api_suggest():
     )  # Tipo de cálculo de vacaciones
     min_win = int(data.get("minWin", 7))
     max_win = int(data.get("maxWin", 14))
+    invalid = window_range_error(min_win, max_win)
+    if invalid:
+        return invalid
+    engine = data.get("engine", "classic")  # "classic" | "vectorized" | "parallel"
+    if engine not in SUGGEST_ENGINES:
+        return jsonify({"error": f"Motor de sugerencias inválido: {engine}"}), 400
+    try:
+        # Sin "strategies" se ejecutan todas las estrategias registradas
+        strategies = resolve_strategies(data.get("strategies"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    # Plazo opcional en ms desde que llega el request (modo con plazo)
+    deadline_ms = data.get("deadlineMs")
+    if deadline_ms is not None:
+        try:
+            deadline_ms = float(deadline_ms)
+        except (TypeError, ValueError):
+            deadline_ms = 0
+        if deadline_ms <= 0:
+            return jsonify({"error": "deadlineMs debe ser un número positivo"}), 400
+
+    # Control de admisión: sobre el límite duro se rechaza; sobre el blando se
+    # cambia a un motor acotado (vectorizado o con plazo) para no ocupar el worker
+    cost = suggest_cost(start, end, min_win, max_win, strategies)
+    if cost > app.config["SUGGEST_COST_HARD_LIMIT"]:
+        return cost_rejected(cost)
+    route = admission_route(cost, strategies)
+    degraded = route is not None
+    if route == "vectorized":
+        engine = "vectorized"
+    elif route == "deadline":
+        soft_deadline = app.config["SUGGEST_DEGRADED_DEADLINE_MS"]
+        deadline_ms = soft_deadline if deadline_ms is None else min(deadline_ms, soft_deadline)
+    cost_header = {"X-Suggest-Cost": str(cost)}
 
     overrides = data.get("overrides") or {}  # NUEVO
-    sched = build_schedule(start, end, pattern_start, pattern, overrides=overrides)
     hols = holidays_by_date(start, end, scope)
 
-    def day_is_free(day: dict) -> bool:
-        d = parse_iso(day["date"])
-        is_wknd = is_weekend(d)
-        is_holiday = bool(hols.get(day["date"]))
-
-        if vacation_calculation == "traditional":
-            # Tradicional: solo lunes a viernes cuentan como trabajo
-            return is_wknd or is_holiday
-        elif vacation_calculation == "shift-based":
-            # Según turnos: usar el patrón de turnos
-            return day["kind"] == "L" or is_wknd or is_holiday
-        elif vacation_calculation == "all-days":
-            # Todos los días: solo feriados son libres
-            return is_holiday
-        else:
-            # Por defecto: tradicional
-            return is_wknd or is_holiday
-
-    # Sistema de IA Inteligente Avanzado para Sugerencias
-    def ai_analyze_vacation_opportunities():
-        """IA avanzada que analiza múltiples estrategias con algoritmos optimizados"""
-
-        # Estrategia 1: Maximizar días libres consecutivos (Optimizada)
-        def strategy_max_consecutive_free():
-            results = []
-            n = len(sched)
-
-            for i in range(n):
-                for length in range(min_win, max_win + 1):
-                    if i + length - 1 >= n:
-                        break
-                    window = sched[i : i + length]
-                    vac_needed = 0
-                    hol_count = 0
-                    irr_count = 0
-                    consecutive_free = 0
-                    max_consecutive = 0
-                    total_free_days = 0
-                    free_segments = []
-                    work_days_avoided = 0
-                    night_shifts_avoided = 0
-
-                    # Analizar segmentos de días libres consecutivos
-                    current_segment = 0
-                    for day in window:
-                        hs = hols.get(day["date"], [])
-                        if not day_is_free(day):
-                            vac_needed += 1
-                            work_days_avoided += 1
-                            if day["kind"] == "N":
-                                night_shifts_avoided += 1
-                            if current_segment > 0:
-                                free_segments.append(current_segment)
-                                current_segment = 0
-                        else:
-                            consecutive_free += 1
-                            current_segment += 1
-                            total_free_days += 1
-                            max_consecutive = max(max_consecutive, consecutive_free)
-
-                        if hs:
-                            hol_count += 1
-                            if any(h["irrenunciable"] for h in hs):
-                                irr_count += 1
-
-                    # Agregar el último segmento si existe
-                    if current_segment > 0:
-                        free_segments.append(current_segment)
-
-                    if vac_needed <= vac_budget and vac_needed > 0:
-                        # Score mejorado con múltiples factores
-                        segment_bonus = sum(
-                            seg * seg * seg for seg in free_segments
-                        )  # Cúbico para preferir segmentos largos
-                        free_ratio = total_free_days / length
-                        efficiency_bonus = (
-                            length - vac_needed
-                        ) / length  # Eficiencia de vacaciones
-                        night_shift_bonus = (
-                            night_shifts_avoided * 2
-                        )  # Bonus por evitar noches
-
-                        score = (
-                            (
-                                length * 2
-                                + segment_bonus
-                                + max_consecutive * 4
-                                + night_shift_bonus
-                            )
-                            / max(1, vac_needed)
-                            * (1 + free_ratio + efficiency_bonus)
-                        )
-
-                        results.append(
-                            {
-                                "start": window[0]["date"],
-                                "end": window[-1]["date"],
-                                "len": length,
-                                "used": vac_needed,
-                                "holCount": hol_count,
-                                "irrCount": irr_count,
-                                "score": round(score, 2),
-                                "strategy": "max_consecutive",
-                                "ai_reason": f"Maximiza {max_consecutive} días libres consecutivos + {len(free_segments)} segmentos + evita {night_shifts_avoided} noches",
-                            }
-                        )
-
-            return results
-
-        # Estrategia 2: Optimizar alrededor de feriados (Optimizada)
-        def strategy_holiday_optimization():
-            results = []
-            n = len(sched)
-
-            # Encontrar feriados en el rango
-            holiday_dates = set()
-            for day in sched:
-        if hols.get(day["date"]):
-                    holiday_dates.add(day["date"])
-
-            for holiday_date in holiday_dates:
-                # Buscar ventanas que incluyan el feriado
-                holiday_idx = next(
-                    i for i, d in enumerate(sched) if d["date"] == holiday_date
-                )
-
-                for length in range(min_win, max_win + 1):
-                    # Probar múltiples posiciones alrededor del feriado
-                    for offset in range(-length // 2, length // 2 + 1):
-                        start_idx = max(0, holiday_idx + offset)
-                        end_idx = min(n - 1, start_idx + length - 1)
-
-                        if end_idx - start_idx + 1 < min_win:
-                            continue
-
-                        window = sched[start_idx : end_idx + 1]
-                        vac_needed = 0
-                        hol_count = 0
-                        irr_count = 0
-                        holiday_center_bonus = 0
-                        work_days_around_holiday = 0
-                        night_shifts_around_holiday = 0
-
-                        for j, day in enumerate(window):
-                            hs = hols.get(day["date"], [])
-                            if not day_is_free(day):
-                                vac_needed += 1
-                                work_days_around_holiday += 1
-                                if day["kind"] == "N":
-                                    night_shifts_around_holiday += 1
-                            if hs:
-                                hol_count += 1
-                                if any(h["irrenunciable"] for h in hs):
-                                    irr_count += 1
-                                # Bonus extra si el feriado está en el centro de la ventana
-                                if day["date"] == holiday_date:
-                                    center_distance = abs(j - length // 2)
-                                    holiday_center_bonus = (
-                                        max(0, 5 - center_distance) * 2
-                                    )
-
-                        if vac_needed <= vac_budget and vac_needed > 0:
-                            # Score mejorado con múltiples factores
-                            holiday_bonus = hol_count * 3.0 + holiday_center_bonus
-                            free_days = length - vac_needed
-                            efficiency_bonus = (length - vac_needed) / length
-                            night_shift_bonus = night_shifts_around_holiday * 2
-
-                            score = (
-                                (
-                                    length * 1.5
-                                    + holiday_bonus
-                                    + free_days
-                                    + night_shift_bonus
-                                )
-                                / max(1, vac_needed)
-                                * (1 + efficiency_bonus)
-                            )
-
-                            results.append(
-                                {
-                                    "start": window[0]["date"],
-                                    "end": window[-1]["date"],
-                                    "len": length,
-                                    "used": vac_needed,
-                                    "holCount": hol_count,
-                                    "irrCount": irr_count,
-                                    "score": round(score, 2),
-                                    "strategy": "holiday_optimization",
-                                    "ai_reason": f"Optimiza {hol_count} feriados (centrado: {holiday_center_bonus:.1f}) + evita {night_shifts_around_holiday} noches",
-                                }
-                            )
-
-            return results
-
-        # Estrategia 3: Minimizar días de trabajo sacrificados (Optimizada)
-        def strategy_minimize_work_loss():
-    results = []
-    n = len(sched)
-
-    for i in range(n):
-        for length in range(min_win, max_win + 1):
-            if i + length - 1 >= n:
-                break
-                    window = sched[i : i + length]
-            vac_needed = 0
-            hol_count = 0
-            irr_count = 0
-                    work_days_saved = 0
-                    night_shifts_avoided = 0
-                    day_shifts_avoided = 0
-                    consecutive_work_penalty = 0
-                    weekend_connections = 0
-
-                    # Analizar patrones de trabajo
-                    for j, day in enumerate(window):
-                        hs = hols.get(day["date"], [])
-                        if not day_is_free(day):
-                            vac_needed += 1
-                            # Bonus por evitar días de trabajo difíciles
-                            if day["kind"] == "N":  # Turno de noche
-                                work_days_saved += 4  # Más peso a turnos de noche
-                                night_shifts_avoided += 1
-                            elif day["kind"] == "D":  # Turno de día
-                                work_days_saved += 1
-                                day_shifts_avoided += 1
-
-                            # Bonus por conectar con fines de semana
-                            d = parse_iso(day["date"])
-                            if d.weekday() in [4, 0]:  # Viernes o Lunes
-                                weekend_connections += 1
-
-                            # Penalizar secuencias largas de trabajo
-                            if j > 0 and not day_is_free(window[j - 1]):
-                                consecutive_work_penalty += 0.3
-                        if hs:
-                            hol_count += 1
-                            if any(h["irrenunciable"] for h in hs):
-                                irr_count += 1
-
-                    if vac_needed <= vac_budget and vac_needed > 0:
-                        # Score mejorado con análisis de patrones
-                        base_score = length * 1.5 + work_days_saved
-                        pattern_bonus = (
-                            night_shifts_avoided * 3
-                        )  # Bonus extra por evitar noches
-                        weekend_bonus = weekend_connections * 2  # Bonus por puentes
-                        efficiency_bonus = (length - vac_needed) / length
-
-                        final_score = (
-                            (
-                                base_score
-                                + pattern_bonus
-                                + weekend_bonus
-                                - consecutive_work_penalty
-                            )
-                            / max(1, vac_needed)
-                            * (1 + efficiency_bonus)
-                        )
-
-                        results.append(
-                            {
-                                "start": window[0]["date"],
-                                "end": window[-1]["date"],
-                                "len": length,
-                                "used": vac_needed,
-                                "holCount": hol_count,
-                                "irrCount": irr_count,
-                                "score": round(final_score, 2),
-                                "strategy": "minimize_work_loss",
-                                "ai_reason": f"Evita {night_shifts_avoided} noches + {day_shifts_avoided} días + {weekend_connections} puentes",
-                            }
-                        )
-
-            return results
-
-        # Estrategia 4: Optimización de puentes (Mejorada)
-        def strategy_bridge_optimization():
-            results = []
-            n = len(sched)
-
-            for i in range(n):
-                for length in range(min_win, max_win + 1):
-                    if i + length - 1 >= n:
-                        break
-                    window = sched[i : i + length]
-                    vac_needed = 0
-                    hol_count = 0
-                    irr_count = 0
-                    bridge_bonus = 0
-                    weekend_connections = 0
-
-                    for j, day in enumerate(window):
-                        hs = hols.get(day["date"], [])
-                        d = parse_iso(day["date"])
-
-                        if not day_is_free(day):
-                            vac_needed += 1
-                            # Bonus por crear puentes
-                            if d.weekday() == 4:  # Viernes
-                                bridge_bonus += 2.0
-                                weekend_connections += 1
-                            elif d.weekday() == 0:  # Lunes
-                                bridge_bonus += 2.0
-                                weekend_connections += 1
-                            elif d.weekday() == 3:  # Jueves
-                                bridge_bonus += 1.0
-                            elif d.weekday() == 1:  # Martes
-                                bridge_bonus += 1.0
-                        if hs:
-                            hol_count += 1
-                            if any(h["irrenunciable"] for h in hs):
-                                irr_count += 1
-
-                    if vac_needed <= vac_budget:
-                        # Score mejorado con análisis de conexiones de fin de semana
-                        bridge_score = (
-                            length + bridge_bonus + weekend_connections * 1.5
-                        ) / max(1, vac_needed)
-                        results.append(
-                            {
-                                "start": window[0]["date"],
-                                "end": window[-1]["date"],
-                                "len": length,
-                                "used": vac_needed,
-                                "holCount": hol_count,
-                                "irrCount": irr_count,
-                                "score": round(bridge_score, 2),
-                                "strategy": "bridge_optimization",
-                                "ai_reason": f"Crea {weekend_connections} puentes + {bridge_bonus:.1f} bonus",
-                            }
-                        )
+    cache_key = suggest_cache_key(
+        start,
+        end,
+        pattern_start,
+        pattern,
+        overrides,
+        vac_budget,
+        vacation_calculation,
+        min_win,
+        max_win,
+        strategies,
+        hols,
+    )
+    # Usuarios con sesión: historial persistente en ai_suggestions (la huella
+    # es la misma del cache)
+    user_id = current_user_id()
+    cached, stored = known_suggestions(user_id, cache_key)
+    if cached is not None:
+        meta = {"engine": engine, "cached": True}
+        if stored:
+            meta["stored"] = True
+        return jsonify({"suggestions": cached, "meta": meta}), cost_header
 
-            return results
-
-        # Estrategia 5: Optimización de temporadas (Optimizada)
-        def strategy_seasonal_optimization():
-            results = []
-            n = len(sched)
-
-            # Definir temporadas preferidas (verano, navidad, etc.)
-            def get_season_bonus(date_str):
-                d = parse_iso(date_str)
-                month = d.month
-
-                # Verano (diciembre - febrero)
-                if month in [12, 1, 2]:
-                    return 3.0
-                # Primavera (septiembre - noviembre)
-                elif month in [9, 10, 11]:
-                    return 2.0
-                # Otoño (marzo - mayo)
-                elif month in [3, 4, 5]:
-                    return 1.5
-                # Invierno (junio - agosto)
-                else:
-                    return 1.0
-
-            for i in range(n):
-                for length in range(min_win, max_win + 1):
-                    if i + length - 1 >= n:
-                        break
-                    window = sched[i : i + length]
-                    vac_needed = 0
-                    hol_count = 0
-                    irr_count = 0
-                    seasonal_bonus = 0
-
-            for day in window:
-                hs = hols.get(day["date"], [])
-                if not day_is_free(day):
-                    vac_needed += 1
-                            seasonal_bonus += get_season_bonus(day["date"])
-                if hs:
-                    hol_count += 1
-                    if any(h["irrenunciable"] for h in hs):
-                        irr_count += 1
-
-            if vac_needed <= vac_budget:
-                        # Score con bonus de temporada
-                        seasonal_score = (length + seasonal_bonus) / max(1, vac_needed)
-                        results.append(
-                            {
-                    "start": window[0]["date"],
-                    "end": window[-1]["date"],
-                    "len": length,
-                    "used": vac_needed,
-                    "holCount": hol_count,
-                    "irrCount": irr_count,
-                                "score": round(seasonal_score, 2),
-                                "strategy": "seasonal_optimization",
-                                "ai_reason": f"Temporada preferida + {seasonal_bonus:.1f} bonus",
-                            }
-                        )
+    sched = build_schedule(start, end, pattern_start, pattern, overrides=overrides)
 
-            return results
-
-        # Estrategia 6: Análisis inteligente de patrones de turnos (Optimizada)
-        def strategy_pattern_analysis():
-            results = []
-            n = len(sched)
-            date_to_idx = {
-                d["date"]: i for i, d in enumerate(sched)
-            }  # NUEVO: O(1) lookup
-
-            # Analizar el patrón de turnos para identificar oportunidades
-            def analyze_shift_pattern():
-                pattern_analysis = {
-                    "night_clusters": [],  # Grupos de noches consecutivas
-                    "day_clusters": [],  # Grupos de días consecutivos
-                    "free_gaps": [],  # Espacios libres entre trabajo
-                    "work_streaks": [],  # Racha de trabajo
+    # Atributos por día y estadísticas acumuladas: cualquier conteo de una
+    # ventana se obtiene en O(1) sin volver a parsear fechas
+    features = DayFeatures(sched, hols)
+
+    # Tiempo (ms) y candidatos generados por cada estrategia
+    strategy_meta = {}
+    coverage = None
+    if engine == "vectorized" and route != "deadline":
+        try:
+            results = vectorized_suggestions(
+                features,
+                vacation_calculation,
+                vac_budget,
+                min_win,
+                max_win,
+                strategies,
+                strategy_meta,
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+    else:
+        # Seis estrategias con selección top-k acotada: solo se guardan las
+        # mejores sugerencias de cada estrategia, no todas las ventanas evaluadas
+        ctx = SuggestionContext(
+            features,
+            vacation_calculation,
+            vac_budget,
+            min_win,
+            max_win,
+            pattern_period(len(expand_pattern(pattern))),
+        )
+        if deadline_ms is not None:
+            # Lo más prometedor primero; al vencer el plazo se devuelve lo
+            # encontrado hasta ahí. El motor vectorizado no usa plazo.
+            results, coverage = deadline_suggestions(
+                ctx, received + deadline_ms / 1000, strategies, strategy_meta
+            )
+        elif engine == "parallel":
+            results = parallel_suggestions(
+                ctx,
+                app.config["SUGGEST_POOL_SIZE"],
+                app.config["SUGGEST_PARALLEL_MIN_WORK"],
+                strategies,
+                strategy_meta,
+            )
+        else:
+            results = classic_suggestions(ctx, strategies, strategy_meta)
+
+    response = {
+        "suggestions": results,
+        "meta": {
+            "engine": engine,
+            "cached": False,
+            "strategies": strategy_meta,
+            "cost": cost,
+            "degraded": degraded,
+        },
+    }
+    if coverage is not None:
+        response["partial"] = coverage.pop("partial")
+        response["coverage"] = coverage
+    # Un resultado parcial no se guarda: el próximo request puede completarlo
+    if not response.get("partial"):
+        suggestion_cache.set(cache_key, results)
+        if user_id is not None:
+            save_suggestions(user_id, cache_key, results)
+    return jsonify(response), cost_header
+
+
+@app.post("/api/suggest/stream")
+def api_suggest_stream():
+    """
+    Variante en streaming de /api/suggest. Cada estrategia envía sus
+    sugerencias definitivas apenas termina (de la más barata a la más cara) y
+    al final llega el ranking combinado y diversificado. Por defecto NDJSON
+    (un objeto JSON por línea); con `Accept: text/event-stream` o
+    `"format": "sse"` se envían como Server-Sent Events.
+    """
+    received = time.perf_counter()
+    data = request.get_json(force=True)
+    start = data["start"]
+    end = data["end"]
+    pattern_start = data["patternStart"]
+    pattern = data["pattern"]
+    scope = "nacional+electoral"  # Siempre incluir feriados nacionales y electorales
+    vac_budget = int(data.get("vacBudget", 15))
+    vacation_calculation = data.get("vacationCalculation", "traditional")
+    min_win = int(data.get("minWin", 7))
+    max_win = int(data.get("maxWin", 14))
+    invalid = window_range_error(min_win, max_win)
+    if invalid:
+        return invalid
+    try:
+        strategies = resolve_strategies(data.get("strategies"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    sse = data.get("format") == "sse" or "text/event-stream" in request.headers.get(
+        "Accept", ""
+    )
+    # Mismo control de admisión que /api/suggest: sobre el límite blando no
+    # hay eventos por estrategia, solo un "final" del motor vectorizado o con plazo
+    cost = suggest_cost(start, end, min_win, max_win, strategies)
+    if cost > app.config["SUGGEST_COST_HARD_LIMIT"]:
+        return cost_rejected(cost)
+    route = admission_route(cost, strategies)
+
+    overrides = data.get("overrides") or {}
+    hols = holidays_by_date(start, end, scope)
+    cache_key = suggest_cache_key(
+        start,
+        end,
+        pattern_start,
+        pattern,
+        overrides,
+        vac_budget,
+        vacation_calculation,
+        min_win,
+        max_win,
+        strategies,
+        hols,
+    )
+    user_id = current_user_id()
+
+    def encode(event: dict) -> str:
+        payload = json.dumps(event, ensure_ascii=False)
+        if sse:
+            return f"event: {event['type']}\ndata: {payload}\n\n"
+        return payload + "\n"
+
+    def events():
+        cached, stored = known_suggestions(user_id, cache_key)
+        if cached is not None:
+            meta = {"cached": True}
+            if stored:
+                meta["stored"] = True
+            yield encode({"type": "final", "suggestions": cached, "meta": meta})
+            return
+
+        sched = build_schedule(start, end, pattern_start, pattern, overrides=overrides)
+        features = DayFeatures(sched, hols)
+        strategy_meta = {}
+        if route == "vectorized":
+            suggestions = vectorized_suggestions(
+                features,
+                vacation_calculation,
+                vac_budget,
+                min_win,
+                max_win,
+                strategies,
+                strategy_meta,
+            )
+            suggestion_cache.set(cache_key, suggestions)
+            if user_id is not None:
+                save_suggestions(user_id, cache_key, suggestions)
+            yield encode(
+                {
+                    "type": "final",
+                    "suggestions": suggestions,
+                    "meta": {
+                        "engine": "vectorized",
+                        "cached": False,
+                        "strategies": strategy_meta,
+                        "degraded": True,
+                    },
                 }
+            )
+            return
+
+        ctx = SuggestionContext(
+            features,
+            vacation_calculation,
+            vac_budget,
+            min_win,
+            max_win,
+            pattern_period(len(expand_pattern(pattern))),
+        )
+        if route == "deadline":
+            deadline = received + app.config["SUGGEST_DEGRADED_DEADLINE_MS"] / 1000
+            suggestions, coverage = deadline_suggestions(
+                ctx, deadline, strategies, strategy_meta
+            )
+            partial = coverage.pop("partial")
+            # Un resultado parcial no se guarda: el próximo request puede completarlo
+            if not partial:
+                suggestion_cache.set(cache_key, suggestions)
+                if user_id is not None:
+                    save_suggestions(user_id, cache_key, suggestions)
+            yield encode(
+                {
+                    "type": "final",
+                    "suggestions": suggestions,
+                    "partial": partial,
+                    "coverage": coverage,
+                    "meta": {
+                        "cached": False,
+                        "strategies": strategy_meta,
+                        "degraded": True,
+                    },
+                }
+            )
+            return
 
-                current_cluster = {"type": None, "start": 0, "length": 0}
-
-                for i, day in enumerate(sched):
-                    if day["kind"] == "L":
-                        # Si hay un cluster activo, finalizarlo
-                        if current_cluster["type"]:
-                            cluster_key = (
-                                "night_clusters"
-                                if current_cluster["type"] == "N"
-                                else "day_clusters"
-                            )
-                            pattern_analysis[cluster_key].append(
-                                {
-                                    "start": current_cluster["start"],
-                                    "end": i - 1,
-                                    "length": current_cluster["length"],
-                                }
-                            )
-                            current_cluster = {"type": None, "start": 0, "length": 0}
-                    else:
-                        # Es un día de trabajo
-                        if current_cluster["type"] == day["kind"]:
-                            # Continuar cluster
-                            current_cluster["length"] += 1
-                        else:
-                            # Finalizar cluster anterior y comenzar nuevo
-                            if current_cluster["type"]:
-                                cluster_key = (
-                                    "night_clusters"
-                                    if current_cluster["type"] == "N"
-                                    else "day_clusters"
-                                )
-                                pattern_analysis[cluster_key].append(
-                                    {
-                                        "start": current_cluster["start"],
-                                        "end": i - 1,
-                                        "length": current_cluster["length"],
-                                    }
-                                )
-                            current_cluster = {
-                                "type": day["kind"],
-                                "start": i,
-                                "length": 1,
-                            }
-
-                # Finalizar último cluster si existe
-                if current_cluster["type"]:
-                    cluster_key = (
-                        "night_clusters"
-                        if current_cluster["type"] == "N"
-                        else "day_clusters"
-                    )
-                    pattern_analysis[cluster_key].append(
-                        {
-                            "start": current_cluster["start"],
-                            "end": n - 1,
-                            "length": current_cluster["length"],
-                        }
-                    )
-
-                return pattern_analysis
-
-            pattern_data = analyze_shift_pattern()
-
-            # Buscar oportunidades basadas en el análisis de patrones
-            for night_cluster in pattern_data["night_clusters"]:
-                if night_cluster["length"] >= 2:  # Solo clusters de 2+ noches
-                    # Buscar ventanas que incluyan este cluster
-                    cluster_start = night_cluster["start"]
-                    cluster_end = night_cluster["end"]
-
-                    for length in range(min_win, max_win + 1):
-                        # Probar diferentes posiciones alrededor del cluster
-                        for offset in range(-length // 3, length // 3 + 1):
-                            start_idx = max(0, cluster_start + offset)
-                            end_idx = min(n - 1, start_idx + length - 1)
-
-                            if end_idx - start_idx + 1 < min_win:
-                                continue
-
-                            window = sched[start_idx : end_idx + 1]
-                            vac_needed = 0
-                            hol_count = 0
-                            irr_count = 0
-                            night_shifts_in_window = 0
-                            cluster_coverage = 0
-
-                            for day in window:
-                                hs = hols.get(day["date"], [])
-                                if not day_is_free(day):
-                                    vac_needed += 1
-                                    if day["kind"] == "N":
-                                        night_shifts_in_window += 1
-                                        # Verificar si está en el cluster original
-                                        day_idx = date_to_idx[day["date"]]  # O(1)
-                                        if cluster_start <= day_idx <= cluster_end:
-                                            cluster_coverage += 1
-                                if hs:
-                                    hol_count += 1
-                                    if any(h["irrenunciable"] for h in hs):
-                                        irr_count += 1
-
-                            if (
-                                vac_needed <= vac_budget
-                                and vac_needed > 0
-                                and cluster_coverage > 0
-                            ):
-                                # Score basado en cobertura del cluster y eficiencia
-                                cluster_bonus = (
-                                    cluster_coverage * 3
-                                )  # Bonus por cubrir noches del cluster
-                                efficiency_bonus = (length - vac_needed) / length
-                                night_avoidance_bonus = night_shifts_in_window * 2
-
-                                score = (
-                                    (
-                                        length * 1.5
-                                        + cluster_bonus
-                                        + night_avoidance_bonus
-                                    )
-                                    / max(1, vac_needed)
-                                    * (1 + efficiency_bonus)
-                                )
-
-                                results.append(
-                                    {
-                                        "start": window[0]["date"],
-                                        "end": window[-1]["date"],
-                                        "len": length,
-                                        "used": vac_needed,
-                                        "holCount": hol_count,
-                                        "irrCount": irr_count,
-                                        "score": round(score, 2),
-                                        "strategy": "pattern_analysis",
-                                        "ai_reason": f"Analiza patrón: cubre {cluster_coverage}/{night_cluster['length']} noches del cluster",
-                                    }
-                                )
-
-            return results
-
-        # Combinar todas las estrategias
-        all_results = []
-        all_results.extend(strategy_max_consecutive_free())
-        all_results.extend(strategy_holiday_optimization())
-        all_results.extend(strategy_minimize_work_loss())
-        all_results.extend(strategy_bridge_optimization())
-        all_results.extend(strategy_seasonal_optimization())
-        all_results.extend(strategy_pattern_analysis())
-
-        # Eliminar duplicados y ordenar con algoritmo mejorado
-        unique_results = {}
-        for result in all_results:
-            key = (result["start"], result["end"])
-            if key not in unique_results:
-                unique_results[key] = result
+        for kind, name, suggestions in stream_suggestions(
+            ctx, strategies, strategy_meta
+        ):
+            if kind == "strategy":
+                yield encode(
+                    {
+                        "type": "strategy",
+                        "strategy": name,
+                        "suggestions": suggestions,
+                        "meta": strategy_meta[name],
+                    }
+                )
             else:
-                # Si ya existe, mantener el de mayor score o el más diverso
-                existing = unique_results[key]
-                if result["score"] > existing["score"]:
-                    unique_results[key] = result
-                elif (
-                    result["score"] == existing["score"]
-                    and result["strategy"] != existing["strategy"]
-                ):
-                    # Si tienen el mismo score pero diferente estrategia, mantener ambos
-                    unique_results[f"{key}_alt"] = result
-
-        final_results = list(unique_results.values())
-
-        # Ordenar por score y diversidad de estrategias
-        final_results.sort(key=lambda r: (r["score"], r["len"]), reverse=True)
-
-        # Asegurar diversidad: máximo 3 por estrategia en los primeros 15
-        diverse_results = []
-        strategy_counts = {}
+                suggestion_cache.set(cache_key, suggestions)
+                if user_id is not None:
+                    save_suggestions(user_id, cache_key, suggestions)
+                yield encode(
+                    {
+                        "type": "final",
+                        "suggestions": suggestions,
+                        "meta": {"cached": False, "strategies": strategy_meta},
+                    }
+                )
 
-        for result in final_results:
-            strategy = result["strategy"]
-            if strategy not in strategy_counts:
-                strategy_counts[strategy] = 0
+    return Response(
+        stream_with_context(events()),
+        mimetype="text/event-stream" if sse else "application/x-ndjson",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+            "X-Suggest-Cost": str(cost),
+        },
+    )
 
-            if strategy_counts[strategy] < 3:
-                diverse_results.append(result)
-                strategy_counts[strategy] += 1
 
-            if len(diverse_results) >= 15:
-                break
+@app.get("/api/suggest/cache")
+def api_suggest_cache_stats():
+    """Contadores del cache de sugerencias (aciertos, fallos, tamaño)"""
+    return jsonify(suggestion_cache.stats())
 
-        return diverse_results
 
-    # Usar el sistema de IA
-    results = ai_analyze_vacation_opportunities()
+@app.post("/api/plan/optimal")
+def api_plan_optimal():
+    """
+    Plan anual: reparte vacBudget en varias ventanas sin traslape (de minWin a
+    maxWin días) que maximizan el total de días de descanso.
+    """
+    data = request.get_json(force=True)
+    start = data["start"]
+    end = data["end"]
+    pattern_start = data["patternStart"]
+    pattern = data["pattern"]
+    scope = "nacional+electoral"  # Siempre incluir feriados nacionales y electorales
+    vac_budget = int(data.get("vacBudget", 15))
+    vacation_calculation = data.get("vacationCalculation", "traditional")
+    min_win = int(data.get("minWin", 7))
+    max_win = int(data.get("maxWin", 14))
+    invalid = window_range_error(min_win, max_win)
+    if invalid:
+        return invalid
+    # El plan recorre las mismas ventanas que /api/suggest: mismo límite duro
+    cost = suggest_cost(start, end, min_win, max_win, resolve_strategies())
+    if cost > app.config["SUGGEST_COST_HARD_LIMIT"]:
+        return cost_rejected(cost)
+
+    overrides = data.get("overrides") or {}
+    sched = build_schedule(start, end, pattern_start, pattern, overrides=overrides)
+    hols = holidays_by_date(start, end, scope)
 
-    return jsonify({"suggestions": results})
+    features = DayFeatures(sched, hols)
+    plan = optimal_plan(features, vacation_calculation, vac_budget, min_win, max_win)
+    return jsonify({"plan": plan}), {"X-Suggest-Cost": str(cost)}
 
 
 @app.post("/api/export_ics")
@@ -1295,17 +1498,20 @@ def api_export_ics():
 @app.post("/api/export_csv")
 def api_export_csv():
     """
-    Recibe JSON: { "schedule": [...], "holidays": {...}, "vacations": [...] }
-    Devuelve un CSV con el calendario completo para RR.HH.
+    Recibe JSON: { "schedule": [...], "vacations": [...] }
+    Devuelve un CSV con el calendario completo para RR.HH. Los feriados salen
+    del índice por año (los mismos de /api/build), no del cliente.
     """
     data = request.get_json(force=True)
     schedule = data.get("schedule", [])
-    holidays = data.get("holidays", {})
     vacations = set(data.get("vacations", []))
 
     if not schedule:
         return jsonify({"error": "No hay datos de calendario"}), 400
 
+    days = [day["date"] for day in schedule]
+    holidays = holidays_by_date(min(days), max(days), "nacional+electoral")
+
     # Crear CSV en memoria
     output = io.StringIO()
     writer = csv.writer(output)
@@ -1369,15 +1575,7 @@ def api_export_csv():
 def api_get_holidays(year: int):
     """Endpoint para obtener feriados de un año específico"""
     try:
-        source = "local"
-        holidays = get_holidays_for_year(year)
-        if year >= 2027:
-            api_h = get_holidays_from_api(year)
-            if api_h:
-                holidays = api_h
-                source = "api"
-            else:
-                source = "local-fallback"
+        holidays, source = fetch_year_holidays(year)
         return jsonify(
             {
                 "year": year,
@@ -1809,6 +2007,153 @@ def api_get_company_employees():
         return jsonify({"error": f"Error al obtener empleados: {str(e)}"}), 500
 
 
+@app.post("/api/company/suggest/batch")
+@login_required
+def api_company_suggest_batch():
+    """
+    Sugerencias para varios empleados en un solo request. El rango, el tipo de
+    cálculo, las ventanas y las estrategias son comunes; cada empleado trae su
+    patrón, inicio de patrón, overrides y cupo. Los feriados se consultan una
+    vez y los empleados con el mismo calendario comparten tabla de atributos;
+    si además tienen el mismo cupo, las sugerencias se calculan una sola vez.
+    """
+    if not current_user.is_company_user:
+        return jsonify({"error": "Solo empresas pueden pedir sugerencias por lote"}), 403
+
+    received = time.perf_counter()
+    data = request.get_json(force=True)
+    start = data["start"]
+    end = data["end"]
+    scope = "nacional+electoral"  # Siempre incluir feriados nacionales y electorales
+    vacation_calculation = data.get("vacationCalculation", "traditional")
+    min_win = int(data.get("minWin", 7))
+    max_win = int(data.get("maxWin", 14))
+    invalid = window_range_error(min_win, max_win)
+    if invalid:
+        return invalid
+    try:
+        strategies = resolve_strategies(data.get("strategies"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    employees = data.get("employees")
+    if not isinstance(employees, list) or not employees:
+        return jsonify({"error": "employees debe ser una lista no vacía"}), 400
+    for pos, emp in enumerate(employees):
+        if not isinstance(emp, dict) or not emp.get("pattern") or not emp.get(
+            "patternStart"
+        ):
+            return (
+                jsonify({"error": f"Empleado {pos}: pattern y patternStart son requeridos"}),
+                400,
+            )
+    # Costo del peor caso: ningún empleado comparte calendario
+    cost = suggest_cost(start, end, min_win, max_win, strategies) * len(employees)
+    if cost > app.config["SUGGEST_COST_HARD_LIMIT"]:
+        return cost_rejected(cost)
+    # Sobre el límite blando el lote usa el motor vectorizado o comparte un
+    # plazo, como /api/suggest
+    route = admission_route(cost, strategies)
+    degraded = route is not None
+    deadline = received + app.config["SUGGEST_DEGRADED_DEADLINE_MS"] / 1000
+
+    hols = holidays_by_date(start, end, scope)
+
+    # Calendario -> atributos por día, y (calendario, cupo) -> sugerencias
+    features_by_schedule: dict[tuple, DayFeatures] = {}
+    suggestions_by_group: dict[tuple, list] = {}
+    coverage_by_group: dict[tuple, dict] = {}
+    computed = cached_groups = 0
+    results = []
+    for emp in employees:
+        pattern = emp["pattern"]
+        pattern_start = emp["patternStart"]
+        overrides = emp.get("overrides") or {}
+        vac_budget = int(emp.get("vacBudget", 15))
+
+        sched = build_schedule(start, end, pattern_start, pattern, overrides=overrides)
+        schedule_key = tuple(day["kind"] for day in sched)
+        group = (schedule_key, vac_budget)
+        suggestions = suggestions_by_group.get(group)
+        if suggestions is None:
+            cache_key = suggest_cache_key(
+                start,
+                end,
+                pattern_start,
+                pattern,
+                overrides,
+                vac_budget,
+                vacation_calculation,
+                min_win,
+                max_win,
+                strategies,
+                hols,
+            )
+            suggestions = suggestion_cache.get(cache_key)
+            if suggestions is None:
+                features = features_by_schedule.get(schedule_key)
+                if features is None:
+                    features = DayFeatures(sched, hols)
+                    features_by_schedule[schedule_key] = features
+                if route == "vectorized":
+                    suggestions = vectorized_suggestions(
+                        features,
+                        vacation_calculation,
+                        vac_budget,
+                        min_win,
+                        max_win,
+                        strategies,
+                    )
+                else:
+                    ctx = SuggestionContext(
+                        features,
+                        vacation_calculation,
+                        vac_budget,
+                        min_win,
+                        max_win,
+                        pattern_period(len(expand_pattern(pattern))),
+                    )
+                    if route == "deadline":
+                        suggestions, coverage = deadline_suggestions(
+                            ctx, deadline, strategies
+                        )
+                        if coverage["partial"]:
+                            coverage_by_group[group] = coverage
+                    else:
+                        suggestions = classic_suggestions(ctx, strategies)
+                # Un resultado parcial no se guarda: el próximo request puede completarlo
+                if group not in coverage_by_group:
+                    suggestion_cache.set(cache_key, suggestions)
+                computed += 1
+            else:
+                cached_groups += 1
+            suggestions_by_group[group] = suggestions
+
+        result = {"id": emp.get("id"), "suggestions": suggestions}
+        coverage = coverage_by_group.get(group)
+        if coverage is not None:
+            result["partial"] = True
+            result["coverage"] = {
+                "ratio": coverage["ratio"],
+                "strategies": coverage["strategies"],
+            }
+        results.append(result)
+
+    return jsonify(
+        {
+            "results": results,
+            "meta": {
+                "employees": len(employees),
+                "groups": len(suggestions_by_group),
+                "computed": computed,
+                "cached": cached_groups,
+                "partial": len(coverage_by_group),
+                "cost": cost,
+                "degraded": degraded,
+            },
+        }
+    ), {"X-Suggest-Cost": str(cost)}
+
+
 @app.get("/api/company/settings")
 @login_required
 def api_get_company_settings():
@@ -2099,9 +2444,22 @@ def api_reset_user_config():
 @app.get("/health")
 def health_check():
     """Endpoint de salud para verificar que la aplicación funciona"""
+    # Mientras se precargan los feriados el proceso aún no está listo
+    if not holidays_ready.is_set():
+        return (
+            jsonify(
+                {
+                    "status": "warming_up",
+                    "holidays": "loading",
+                    "timestamp": datetime.utcnow().isoformat(),
+                }
+            ),
+            503,
+        )
     return jsonify(
         {
             "status": "healthy",
+            "holidays": "ready",
             "database": "available" if db_initialized else "not_configured",
             "database_url": (
                 "configured"
@@ -2197,6 +2555,10 @@ def api_init_database():
         return jsonify({"error": f"Error al inicializar BD: {str(e)}"}), 500
 
 
+# Precarga de feriados al importar la aplicación (cada worker lo hace una vez)
+start_holiday_warmup()
+
+
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 5000))
     app.run(host="0.0.0.0", port=port, debug=False)
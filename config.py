@@ -29,3 +29,42 @@ class Config:
 
     # Configuración de la aplicación
     DEBUG = os.environ.get("FLASK_ENV") == "development"
+
+    # Motor de sugerencias en paralelo (engine="parallel")
+    # Procesos del pool; 0 usa todos los núcleos disponibles
+    SUGGEST_POOL_SIZE = int(os.environ.get("SUGGEST_POOL_SIZE", 0))
+    # Bajo este número de ventanas (días x largos) se calcula en el mismo proceso
+    SUGGEST_PARALLEL_MIN_WORK = int(os.environ.get("SUGGEST_PARALLEL_MIN_WORK", 5000))
+
+    # Cache de /api/suggest: entradas en memoria (0 lo desactiva), vigencia en
+    # segundos y archivo SQLite opcional compartido entre workers
+    SUGGEST_CACHE_SIZE = int(os.environ.get("SUGGEST_CACHE_SIZE", 256))
+    SUGGEST_CACHE_TTL = int(os.environ.get("SUGGEST_CACHE_TTL", 600))
+    SUGGEST_CACHE_DB = os.environ.get("SUGGEST_CACHE_DB", "")
+
+    # Control de admisión de /api/suggest según el costo estimado (ventanas
+    # por estrategia). El límite blando es ~2 s del motor clásico (~1,4 s a
+    # 580k); sobre él se usa el motor vectorizado (~0,1 s a 580k, ~0,8 s y
+    # ~500 MB a 2,5M) hasta el límite vectorizado, y más allá el modo con
+    # plazo (SUGGEST_DEGRADED_DEADLINE_MS); sobre el límite duro se rechaza con 422
+    SUGGEST_COST_SOFT_LIMIT = int(os.environ.get("SUGGEST_COST_SOFT_LIMIT", 500_000))
+    SUGGEST_COST_VECTOR_LIMIT = int(
+        os.environ.get("SUGGEST_COST_VECTOR_LIMIT", 2_500_000)
+    )
+    SUGGEST_COST_HARD_LIMIT = int(os.environ.get("SUGGEST_COST_HARD_LIMIT", 10_000_000))
+    SUGGEST_DEGRADED_DEADLINE_MS = int(
+        os.environ.get("SUGGEST_DEGRADED_DEADLINE_MS", 2000)
+    )
+
+    # Feriados de la API externa (años >= 2027): vigencia en segundos de lo
+    # descargado y de una descarga fallida antes de reintentar
+    HOLIDAY_CACHE_TTL = int(os.environ.get("HOLIDAY_CACHE_TTL", 7 * 86400))
+    HOLIDAY_NEGATIVE_TTL = int(os.environ.get("HOLIDAY_NEGATIVE_TTL", 300))
+
+    # Precarga de feriados al iniciar el proceso: desde el año actual menos
+    # HOLIDAY_WARMUP_PAST hasta más HOLIDAY_WARMUP_FUTURE; /health responde
+    # 503 hasta que termina (o hasta HOLIDAY_WARMUP_TIMEOUT segundos)
+    HOLIDAY_WARMUP = os.environ.get("HOLIDAY_WARMUP", "1") != "0"
+    HOLIDAY_WARMUP_PAST = int(os.environ.get("HOLIDAY_WARMUP_PAST", 1))
+    HOLIDAY_WARMUP_FUTURE = int(os.environ.get("HOLIDAY_WARMUP_FUTURE", 3))
+    HOLIDAY_WARMUP_TIMEOUT = float(os.environ.get("HOLIDAY_WARMUP_TIMEOUT", 15))
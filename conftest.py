@@ -0,0 +1,53 @@
+"""
+Configuración común de las pruebas: base SQLite temporal (no se toca
+instance/opti.db) y sin precarga de feriados al importar la app.
+"""
+
+import os
+import tempfile
+
+_DB_DIR = tempfile.mkdtemp(prefix="opti-test-")
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(_DB_DIR, "opti.db")
+os.environ.setdefault("HOLIDAY_WARMUP", "0")
+
+import pytest  # noqa: E402
+
+import app as app_module  # noqa: E402
+from database import User, db  # noqa: E402
+from suggestion_cache import SuggestionCache  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    """Tablas creadas una vez para toda la sesión"""
+    with app_module.app.app_context():
+        db.create_all()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def suggestion_cache(monkeypatch):
+    """Cada prueba usa un cache de sugerencias propio, vacío"""
+    cache = SuggestionCache(256, 600)
+    monkeypatch.setattr(app_module, "suggestion_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def login():
+    """Función que crea (si no existe) un usuario y deja su sesión iniciada"""
+
+    def login_as(client, email: str, user_type: str = "individual") -> int:
+        with app_module.app.app_context():
+            user = User.query.filter_by(email=email).first()
+            if user is None:
+                user = User(email=email, name=email.split("@")[0], user_type=user_type)
+                db.session.add(user)
+                db.session.commit()
+            user_id = user.id
+        with client.session_transaction() as sess:
+            sess["_user_id"] = str(user_id)
+            sess["_fresh"] = True
+        return user_id
+
+    return login_as
@@ -125,6 +125,22 @@ class AISuggestion(db.Model):
     holidays_included = db.Column(db.Integer, default=0)
     ai_reason = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Huella del request que generó la sugerencia (ver suggest_fingerprint)
+    fingerprint = db.Column(db.String(64))
+    rank = db.Column(db.Integer, default=0)  # Posición en el ranking
+    window_length = db.Column(db.Integer)
+    irr_count = db.Column(db.Integer, default=0)
+
+    # Una fila por posición: dos requests iguales simultáneos no duplican el
+    # ranking (el índice también sirve para buscar por usuario y huella)
+    __table_args__ = (
+        db.UniqueConstraint(
+            "user_id",
+            "fingerprint",
+            "rank",
+            name="uq_ai_suggestions_user_fingerprint_rank",
+        ),
+    )
 
 
 class Holiday(db.Model):
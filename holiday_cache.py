@@ -0,0 +1,107 @@
+"""
+Cache de feriados obtenidos desde la API externa.
+
+Los requests nunca esperan a la red: si un año no está en memoria se busca
+en la base de datos y, si falta o venció, se pide a la API en un thread de
+fondo mientras el request sigue con lo que haya (datos vencidos o el
+respaldo local). Las consultas simultáneas del mismo año se agrupan en una
+sola descarga, y una descarga fallida se recuerda por un rato (cache
+negativo) para no reintentar en cada request.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+
+class HolidayCache:
+    """Feriados por año con TTL, cache negativo y descarga en segundo plano"""
+
+    def __init__(
+        self,
+        fetch,
+        load=None,
+        store=None,
+        ttl: float = 7 * 86400,
+        negative_ttl: float = 300,
+    ):
+        # fetch(year) -> lista (vacía si falló); load(year) -> (lista, epoch
+        # de actualización) o None; store(year, lista) guarda lo descargado
+        self.fetch = fetch
+        self.load = load
+        self.store = store
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries: dict[int, tuple[list[dict] | None, float]] = {}
+        self._inflight: dict[int, threading.Thread] = {}
+        self._lock = threading.Lock()
+
+    def get(self, year: int) -> list[dict] | None:
+        """Feriados guardados del año (aunque estén vencidos) o None"""
+        with self._lock:
+            entry = self._entries.get(year)
+            inflight = year in self._inflight
+
+        if entry is None and not inflight and self.load is not None:
+            try:
+                stored = self.load(year)
+            except Exception as e:
+                print(f"Error al leer feriados guardados de {year}: {e}")
+                stored = None
+            if stored is not None:
+                holidays, updated_at = stored
+                entry = (holidays, updated_at + self.ttl)
+                with self._lock:
+                    self._entries.setdefault(year, entry)
+
+        if entry is None or entry[1] <= time.time():
+            self.refresh(year)
+        return entry[0] if entry is not None else None
+
+    def refresh(self, year: int) -> threading.Thread:
+        """Descarga el año en segundo plano; si ya hay una en curso, la reutiliza"""
+        with self._lock:
+            thread = self._inflight.get(year)
+            if thread is None:
+                thread = threading.Thread(
+                    target=self._download, args=(year,), daemon=True
+                )
+                self._inflight[year] = thread
+                thread.start()
+        return thread
+
+    def wait(self, year: int, timeout: float | None = None) -> None:
+        """Espera la descarga en curso del año, si la hay"""
+        with self._lock:
+            thread = self._inflight.get(year)
+        if thread is not None:
+            thread.join(timeout)
+
+    def _download(self, year: int) -> None:
+        try:
+            holidays = self.fetch(year)
+        except Exception as e:
+            print(f"Error al descargar feriados de {year}: {e}")
+            holidays = []
+
+        now = time.time()
+        with self._lock:
+            if holidays:
+                self._entries[year] = (holidays, now + self.ttl)
+            else:
+                # Cache negativo: se conservan los datos vencidos si los hay
+                previous = self._entries.get(year)
+                kept = previous[0] if previous is not None else None
+                self._entries[year] = (kept, now + self.negative_ttl)
+            del self._inflight[year]
+
+        if holidays and self.store is not None:
+            try:
+                self.store(year, holidays)
+            except Exception as e:
+                print(f"Error al guardar feriados de {year}: {e}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,165 @@
+"""
+Feriados de Chile calculados por reglas, para cualquier año.
+
+Reemplaza al respaldo que copiaba la lista de 2025/2026 cambiando el año,
+que dejaba en días equivocados los feriados que dependen de Pascua, del
+solsticio o de traslados a lunes/viernes. No incluye feriados electorales
+(dependen del calendario de elecciones) ni leyes especiales de un solo año.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from math import cos, radians
+
+# Chile continental en invierno (junio): UTC-4
+CHILE_WINTER_OFFSET = timedelta(hours=-4)
+
+# Términos periódicos (A, B, C) de Meeus, "Astronomical Algorithms", tabla 27.C
+_SOLSTICE_TERMS = (
+    (485, 324.96, 1934.136),
+    (203, 337.23, 32964.467),
+    (199, 342.08, 20.186),
+    (182, 27.85, 445267.112),
+    (156, 73.14, 45036.886),
+    (136, 171.52, 22518.443),
+    (77, 222.54, 65928.934),
+    (74, 296.72, 3034.906),
+    (70, 243.58, 9037.513),
+    (58, 119.81, 33718.147),
+    (52, 297.17, 150.678),
+    (50, 21.02, 2281.226),
+    (45, 247.54, 29929.562),
+    (44, 325.15, 31555.956),
+    (29, 60.93, 4443.417),
+    (18, 155.12, 67555.328),
+    (17, 288.79, 4562.452),
+    (16, 198.04, 62894.029),
+    (14, 199.76, 31436.921),
+    (12, 95.39, 14577.848),
+    (12, 287.11, 31931.756),
+    (12, 320.81, 34777.259),
+    (9, 227.73, 1222.114),
+    (8, 15.45, 16859.074),
+)
+
+
+def easter_sunday(year: int) -> date:
+    """Domingo de Pascua (computus gregoriano anónimo, Meeus/Jones/Butcher)"""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def june_solstice(year: int) -> datetime:
+    """Instante (UTC) del solsticio de junio según Meeus, cap. 27 (años 1000-3000)"""
+    y = (year - 2000) / 1000
+    jde0 = (
+        2451716.56767
+        + 365241.62603 * y
+        + 0.00325 * y**2
+        + 0.00888 * y**3
+        - 0.00030 * y**4
+    )
+    t = (jde0 - 2451545.0) / 36525
+    w = radians(35999.373 * t - 2.47)
+    dl = 1 + 0.0334 * cos(w) + 0.0007 * cos(2 * w)
+    s = sum(a * cos(radians(b + c * t)) for a, b, c in _SOLSTICE_TERMS)
+    jde = jde0 + 0.00001 * s / dl
+    # Día juliano 2440587.5 = 1970-01-01 00:00 UTC (se ignora TT - UT, ~1 min)
+    return datetime(1970, 1, 1, tzinfo=timezone.utc) + timedelta(days=jde - 2440587.5)
+
+
+def moved_to_monday(d: date) -> date:
+    """Ley 19.668: de martes a jueves pasa al lunes anterior; el viernes, al siguiente"""
+    weekday = d.weekday()  # 0 lunes .. 6 domingo
+    if 1 <= weekday <= 3:
+        return d - timedelta(days=weekday)
+    if weekday == 4:
+        return d + timedelta(days=3)
+    return d
+
+
+def moved_to_friday(d: date) -> date:
+    """Ley 20.299: un martes pasa al viernes anterior; un miércoles, al siguiente"""
+    weekday = d.weekday()
+    if weekday == 1:
+        return d - timedelta(days=4)
+    if weekday == 2:
+        return d + timedelta(days=2)
+    return d
+
+
+def _holiday(d: date, name: str, irrenunciable: bool = False, scope: str = "nacional"):
+    return {
+        "date": d.isoformat(),
+        "name": name,
+        "irrenunciable": irrenunciable,
+        "scope": scope,
+    }
+
+
+@lru_cache(maxsize=256)
+def chile_holidays(year: int) -> list[dict]:
+    """
+    Feriados nacionales, regionales y locales del año, en el mismo formato
+    que HOLIDAYS_2025. La lista se comparte entre llamadas: no modificarla.
+    """
+    easter = easter_sunday(year)
+    nacional = [
+        _holiday(date(year, 1, 1), "Año Nuevo", True),
+        _holiday(easter - timedelta(days=2), "Viernes Santo"),
+        _holiday(easter - timedelta(days=1), "Sábado Santo"),
+        _holiday(date(year, 5, 1), "Día del Trabajo", True),
+        _holiday(date(year, 5, 21), "Glorias Navales"),
+        _holiday(moved_to_monday(date(year, 6, 29)), "San Pedro y San Pablo"),
+        _holiday(date(year, 7, 16), "Virgen del Carmen"),
+        _holiday(date(year, 8, 15), "Asunción de la Virgen"),
+        _holiday(date(year, 9, 18), "Independencia Nacional", True),
+        _holiday(date(year, 9, 19), "Glorias del Ejército", True),
+        _holiday(moved_to_monday(date(year, 10, 12)), "Encuentro de Dos Mundos"),
+        _holiday(
+            moved_to_friday(date(year, 10, 31)),
+            "Día de las Iglesias Evangélicas y Protestantes",
+        ),
+        _holiday(date(year, 11, 1), "Todos los Santos"),
+        _holiday(date(year, 12, 8), "Inmaculada Concepción"),
+        _holiday(date(year, 12, 25), "Navidad", True),
+    ]
+    # Ley 21.357: en el solsticio de invierno desde 2021 (ese año, el lunes 21)
+    if year >= 2021:
+        solstice = (june_solstice(year) + CHILE_WINTER_OFFSET).date()
+        if year == 2021:
+            solstice = date(2021, 6, 21)
+        nacional.append(_holiday(solstice, "Día de los Pueblos Indígenas"))
+    # Ley 20.983: el 2 de enero cuando Año Nuevo cae domingo, desde 2017
+    if year >= 2017 and date(year, 1, 1).weekday() == 6:
+        nacional.append(_holiday(date(year, 1, 2), "Feriado adicional de Año Nuevo"))
+    # Ley 20.215: Fiestas Patrias se alargan al lunes 17 o al viernes 20
+    if year >= 2007:
+        if date(year, 9, 17).weekday() == 0:
+            nacional.append(_holiday(date(year, 9, 17), "Fiestas Patrias"))
+        if date(year, 9, 20).weekday() == 4:
+            nacional.append(_holiday(date(year, 9, 20), "Fiestas Patrias"))
+    nacional.sort(key=lambda h: h["date"])
+    return nacional + [
+        _holiday(
+            date(year, 6, 7),
+            "Asalto y Toma del Morro de Arica (regional)",
+            scope="regional:XV",
+        ),
+        _holiday(
+            date(year, 8, 20),
+            "Natalicio de O'Higgins (Chillán y Chillán Viejo)",
+            scope="local:chillan",
+        ),
+    ]
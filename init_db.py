@@ -47,6 +47,12 @@ def init_railway_database():
             db.create_all()
             print("✅ Tablas creadas correctamente")
 
+            # create_all no agrega columnas ni índices a tablas ya existentes
+            from migrations import migrate_ai_suggestions
+
+            if not migrate_ai_suggestions():
+                return False
+
             # Verificar que las tablas existen
             try:
                 from sqlalchemy import inspect
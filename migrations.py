@@ -52,6 +52,52 @@ def init_database():
             return False
 
 
+def migrate_ai_suggestions():
+    """Agregar a ai_suggestions las columnas de huella e índice único si faltan"""
+    print("🔄 Actualizando tabla ai_suggestions...")
+
+    with app.app_context():
+        try:
+            from sqlalchemy import inspect, text
+
+            inspector = inspect(db.engine)
+            columns = {c["name"] for c in inspector.get_columns("ai_suggestions")}
+            new_columns = {
+                "fingerprint": "VARCHAR(64)",
+                "rank": "INTEGER DEFAULT 0",
+                "window_length": "INTEGER",
+                "irr_count": "INTEGER DEFAULT 0",
+            }
+            with db.engine.begin() as conn:
+                for name, ddl in new_columns.items():
+                    if name not in columns:
+                        conn.execute(
+                            text(f"ALTER TABLE ai_suggestions ADD COLUMN {name} {ddl}")
+                        )
+                # Filas repetidas por requests simultáneos: queda la primera
+                conn.execute(
+                    text(
+                        "DELETE FROM ai_suggestions WHERE fingerprint IS NOT NULL "
+                        "AND id NOT IN (SELECT MIN(id) FROM ai_suggestions "
+                        "WHERE fingerprint IS NOT NULL "
+                        "GROUP BY user_id, fingerprint, rank)"
+                    )
+                )
+                conn.execute(
+                    text(
+                        "CREATE UNIQUE INDEX IF NOT EXISTS "
+                        "uq_ai_suggestions_user_fingerprint_rank "
+                        "ON ai_suggestions (user_id, fingerprint, rank)"
+                    )
+                )
+            print("✅ Tabla ai_suggestions actualizada")
+            return True
+
+        except Exception as e:
+            print(f"❌ Error al actualizar ai_suggestions: {e}")
+            return False
+
+
 def create_sample_data():
     """Crear datos de ejemplo para pruebas"""
     print("🔄 Creando datos de ejemplo...")
@@ -153,6 +199,9 @@ def main():
         print("❌ Falló la inicialización de la base de datos")
         sys.exit(1)
 
+    # Columnas nuevas en tablas ya existentes
+    migrate_ai_suggestions()
+
     # Crear datos de ejemplo
     create_sample_data()
 
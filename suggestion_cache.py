@@ -0,0 +1,154 @@
+"""
+Cache de resultados de /api/suggest.
+
+Las sugerencias dependen solo de los parámetros del request y de los feriados
+del rango, así que se guardan bajo una huella normalizada de ambos. Hay un
+nivel en memoria (LRU con TTL, por proceso) y un nivel opcional en SQLite que
+comparten todos los workers de la aplicación.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+def suggest_fingerprint(params: dict, hols: dict) -> str:
+    """
+    Huella canónica de un request de sugerencias.
+
+    `params` debe venir ya normalizado (fase del patrón en vez de la fecha de
+    inicio del patrón, overrides filtrados al rango, números como int); los
+    feriados entran completos para que un cambio en ellos invalide la entrada.
+    """
+    payload = json.dumps(
+        {"params": params, "holidays": hols},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SuggestionCache:
+    """LRU en memoria con TTL y, opcionalmente, un segundo nivel en SQLite"""
+
+    def __init__(self, max_entries: int = 256, ttl: float = 600, db_path: str = ""):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.db_path = db_path
+        self._entries: OrderedDict[str, tuple[float, list]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "disk_hits": 0, "misses": 0, "stores": 0}
+        if db_path:
+            with self._connect() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS suggest_cache ("
+                    "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+                )
+
+    @contextmanager
+    def _connect(self):
+        """Conexión corta: confirma la transacción y se cierra al salir"""
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def _remember(self, key: str, expires_at: float, value: list) -> None:
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key: str) -> list | None:
+        """Devuelve las sugerencias guardadas o None si no hay o expiraron"""
+        if self.max_entries <= 0:
+            self._count("misses")
+            return None
+
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self._counters["hits"] += 1
+                    return entry[1]
+                del self._entries[key]
+
+        if self.db_path:
+            try:
+                with self._connect() as conn:
+                    row = conn.execute(
+                        "SELECT value, expires_at FROM suggest_cache WHERE key = ?",
+                        (key,),
+                    ).fetchone()
+            except sqlite3.Error as e:
+                print(f"Error al leer cache de sugerencias: {e}")
+                row = None
+            if row is not None and row[1] > now:
+                value = json.loads(row[0])
+                self._remember(key, row[1], value)
+                self._count("disk_hits")
+                return value
+
+        self._count("misses")
+        return None
+
+    def set(self, key: str, value: list) -> None:
+        if self.max_entries <= 0:
+            return
+        expires_at = time.time() + self.ttl
+        self._remember(key, expires_at, value)
+        self._count("stores")
+
+        if self.db_path:
+            try:
+                with self._connect() as conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO suggest_cache (key, value, expires_at) "
+                        "VALUES (?, ?, ?)",
+                        (key, json.dumps(value, ensure_ascii=False), expires_at),
+                    )
+                    # Limpieza de entradas vencidas de otros workers
+                    conn.execute(
+                        "DELETE FROM suggest_cache WHERE expires_at <= ?", (time.time(),)
+                    )
+            except sqlite3.Error as e:
+                print(f"Error al guardar cache de sugerencias: {e}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        if self.db_path:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM suggest_cache")
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+            size = len(self._entries)
+        lookups = counters["hits"] + counters["disk_hits"] + counters["misses"]
+        return {
+            **counters,
+            "entries": size,
+            "maxEntries": self.max_entries,
+            "ttl": self.ttl,
+            "disk": bool(self.db_path),
+            "hitRate": round((counters["hits"] + counters["disk_hits"]) / lookups, 4)
+            if lookups
+            else 0.0,
+        }
@@ -0,0 +1,1740 @@
+"""
+Motor de sugerencias de vacaciones.
+
+Contiene las estructuras compartidas por las estrategias de /api/suggest para
+evaluar ventanas de días sin volver a recorrer el calendario en cada ventana.
+"""
+
+from __future__ import annotations
+
+import heapq
+import multiprocessing
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date
+from itertools import accumulate
+from math import gcd
+from operator import itemgetter
+
+import numpy as np
+
+
+def season_bonus(month: int) -> float:
+    """Bonus por temporada preferida según el mes"""
+    # Verano (diciembre - febrero)
+    if month in (12, 1, 2):
+        return 3.0
+    # Primavera (septiembre - noviembre)
+    if month in (9, 10, 11):
+        return 2.0
+    # Otoño (marzo - mayo)
+    if month in (3, 4, 5):
+        return 1.5
+    # Invierno (junio - agosto)
+    return 1.0
+
+
+def pattern_period(pattern_length: int) -> int:
+    """Días tras los que se repiten el patrón de turnos y los días de la semana"""
+    return pattern_length * 7 // gcd(pattern_length, 7)
+
+
+def _prefix(values) -> list:
+    """Suma acumulada con un 0 inicial: prefix[j] - prefix[i] = sum(values[i:j])"""
+    return list(accumulate(values, initial=0))
+
+
+# Códigos de tipo de día en la tabla de atributos
+KIND_FREE = 0
+KIND_DAY = 1
+KIND_NIGHT = 2
+KIND_OTHER = 3
+KIND_CODES = {"L": KIND_FREE, "D": KIND_DAY, "N": KIND_NIGHT}
+
+# Modos de cálculo de vacaciones ("vacationCalculation")
+VACATION_CALCULATIONS = ("traditional", "shift-based", "all-days")
+
+
+class DayFeatures:
+    """
+    Tabla de atributos por día, construida una vez por request.
+
+    Parte de la salida de `build_schedule()` y `holidays_by_date()` y deja
+    en listas paralelas todo lo que las estrategias consultan por día, para
+    no volver a parsear fechas ISO ni buscar feriados dentro de los loops.
+    """
+
+    def __init__(self, sched: list[dict], hols: dict):
+        self.n = len(sched)
+        self.dates = [day["date"] for day in sched]
+        self.ordinals = []
+        self.weekdays = []
+        self.months = []
+        self.seasons = []
+        self.kinds = []
+        self.holiday = []
+        self.irrenunciable = []
+        self.weekend = []
+
+        for day in sched:
+            d = date.fromisoformat(day["date"])
+            hs = hols.get(day["date"])
+            self.ordinals.append(d.toordinal())
+            self.weekdays.append(d.weekday())
+            self.months.append(d.month)
+            self.seasons.append(season_bonus(d.month))
+            self.kinds.append(KIND_CODES.get(day["kind"], KIND_OTHER))
+            self.holiday.append(bool(hs))
+            self.irrenunciable.append(bool(hs) and any(h["irrenunciable"] for h in hs))
+            self.weekend.append(d.weekday() in (5, 6))  # sábado/domingo
+
+        # Día libre según cada modo de cálculo de vacaciones
+        off = [w or h for w, h in zip(self.weekend, self.holiday)]
+        self.free = {
+            # Tradicional: solo lunes a viernes cuentan como trabajo
+            "traditional": off,
+            # Según turnos: usar el patrón de turnos
+            "shift-based": [
+                k == KIND_FREE or o for k, o in zip(self.kinds, off)
+            ],
+            # Todos los días: solo feriados son libres
+            "all-days": list(self.holiday),
+        }
+
+    def free_for(self, vacation_calculation: str) -> list[bool]:
+        """Marcas de día libre para un modo; por defecto el tradicional"""
+        return self.free.get(vacation_calculation, self.free["traditional"])
+
+
+class WindowStats:
+    """
+    Sumas acumuladas del calendario para consultar ventanas en O(1).
+
+    Se construye una sola vez por request sobre la tabla `DayFeatures` y el
+    modo de cálculo de vacaciones. Todas las consultas usan ventanas
+    semiabiertas [i, j) sobre índices del calendario.
+    """
+
+    def __init__(self, features: DayFeatures, vacation_calculation: str):
+        self.n = features.n
+        self.free = free = features.free_for(vacation_calculation)
+
+        work = [not f for f in free]
+        nights = [w and k == KIND_NIGHT for w, k in zip(work, features.kinds)]
+        day_shifts = [w and k == KIND_DAY for w, k in zip(work, features.kinds)]
+        # Viernes o lunes trabajados conectan con el fin de semana
+        weekend_edges = [w and wd in (4, 0) for w, wd in zip(work, features.weekdays)]
+        # Jueves o martes trabajados permiten puentes más largos
+        bridge_days = [w and wd in (3, 1) for w, wd in zip(work, features.weekdays)]
+        seasonal = [b if w else 0.0 for w, b in zip(work, features.seasons)]
+        # Pares de días de trabajo seguidos: work_pairs[k] marca k-1 y k trabajados
+        work_pairs = [False] + [a and b for a, b in zip(work, work[1:])]
+
+        self._work = _prefix(work)
+        self._hol = _prefix(features.holiday)
+        self._irr = _prefix(features.irrenunciable)
+        self._nights = _prefix(nights)
+        self._day_shifts = _prefix(day_shifts)
+        self._weekend_edges = _prefix(weekend_edges)
+        self._bridge_days = _prefix(bridge_days)
+        self._work_pairs = _prefix(work_pairs)
+        self._seasonal = _prefix(seasonal)
+
+        # Tramos de días libres codificados por largo de corrida: inicio y fin
+        # (exclusivo) de cada tramo y suma acumulada de los cubos de sus largos
+        self._run_starts, self._run_ends = [], []
+        for k, is_free in enumerate(free):
+            if is_free and (k == 0 or not free[k - 1]):
+                self._run_starts.append(k)
+            if is_free and (k == self.n - 1 or not free[k + 1]):
+                self._run_ends.append(k + 1)
+        self._run_cubes = _prefix(
+            (e - s) ** 3 for s, e in zip(self._run_starts, self._run_ends)
+        )
+        # _run_at[k]: primer tramo que termina después de k (el que contiene k
+        # o el siguiente); _runs_started[k]: tramos que empiezan antes de k
+        self._run_at = []
+        self._runs_started = []
+        run = started = 0
+        for k in range(self.n + 1):
+            while run < len(self._run_ends) and self._run_ends[run] <= k:
+                run += 1
+            while started < len(self._run_starts) and self._run_starts[started] < k:
+                started += 1
+            self._run_at.append(run)
+            self._runs_started.append(started)
+
+    def vac_needed(self, i: int, j: int) -> int:
+        """Días de trabajo (que consumen vacaciones) en la ventana"""
+        return self._work[j] - self._work[i]
+
+    def holidays(self, i: int, j: int) -> int:
+        """Días con al menos un feriado en la ventana"""
+        return self._hol[j] - self._hol[i]
+
+    def irrenunciables(self, i: int, j: int) -> int:
+        """Días con al menos un feriado irrenunciable en la ventana"""
+        return self._irr[j] - self._irr[i]
+
+    def nights(self, i: int, j: int) -> int:
+        """Turnos de noche trabajados en la ventana"""
+        return self._nights[j] - self._nights[i]
+
+    def day_shifts(self, i: int, j: int) -> int:
+        """Turnos de día trabajados en la ventana"""
+        return self._day_shifts[j] - self._day_shifts[i]
+
+    def weekend_edges(self, i: int, j: int) -> int:
+        """Viernes y lunes trabajados en la ventana"""
+        return self._weekend_edges[j] - self._weekend_edges[i]
+
+    def bridge_days(self, i: int, j: int) -> int:
+        """Jueves y martes trabajados en la ventana"""
+        return self._bridge_days[j] - self._bridge_days[i]
+
+    def work_pairs(self, i: int, j: int) -> int:
+        """Días de trabajo precedidos por otro día de trabajo dentro de la ventana"""
+        if j - i < 2:
+            return 0
+        return self._work_pairs[j] - self._work_pairs[i + 1]
+
+    def seasonal(self, i: int, j: int) -> float:
+        """Suma del bonus de temporada de los días de trabajo de la ventana"""
+        return self._seasonal[j] - self._seasonal[i]
+
+    def free_segments(self, i: int, j: int) -> tuple[int, int]:
+        """
+        Tramos de días libres consecutivos dentro de la ventana: (cantidad,
+        suma de los cubos de sus largos). Los tramos interiores salen de las
+        sumas acumuladas; solo el primero y el último pueden quedar recortados.
+        """
+        first = self._run_at[i]
+        last = self._runs_started[j]
+        count = last - first
+        if count <= 0 or j <= i:
+            return 0, 0
+
+        starts, ends = self._run_starts, self._run_ends
+        cubes = self._run_cubes[last] - self._run_cubes[first]
+        # Recorte del primer tramo (y del último si es el mismo)
+        full = ends[first] - starts[first]
+        clipped = min(ends[first], j) - max(starts[first], i)
+        cubes += clipped**3 - full**3
+        if count > 1:
+            tail = last - 1
+            full = ends[tail] - starts[tail]
+            clipped = min(ends[tail], j) - starts[tail]
+            cubes += clipped**3 - full**3
+        return count, cubes
+
+
+# ====== ESTRATEGIAS ======
+# Cada estrategia genera sus candidatos en el orden de sus loops y sabe
+# listar los candidatos que da a una ventana (inicio, fin) cualquiera; el
+# recolector usa esto último para deduplicar entre estrategias sin guardar
+# todas las ventanas evaluadas.
+
+# Máximo de sugerencias devueltas y máximo por estrategia
+SUGGESTION_LIMIT = 15
+PER_STRATEGY_LIMIT = 3
+
+
+class SuggestionContext:
+    """Datos de un request compartidos por todas las estrategias"""
+
+    def __init__(
+        self,
+        features: DayFeatures,
+        vacation_calculation: str,
+        vac_budget: int,
+        min_win: int,
+        max_win: int,
+        period: int = 0,
+    ):
+        self.features = features
+        self.vacation_calculation = vacation_calculation
+        self.stats = WindowStats(features, vacation_calculation)
+        self.n = features.n
+        self.vac_budget = vac_budget
+        self.min_win = min_win
+        self.max_win = max_win
+
+        # Posiciones de feriados y clusters de 2+ noches consecutivas
+        self.holiday_idx = [i for i, h in enumerate(features.holiday) if h]
+        self.night_clusters = []
+        run_start = None
+        for i, kind in enumerate(features.kinds + [None]):
+            if kind == KIND_NIGHT:
+                if run_start is None:
+                    run_start = i
+            elif run_start is not None:
+                if i - run_start >= 2:
+                    self.night_clusters.append((run_start, i - 1))
+                run_start = None
+        self.cluster_starts = [cs for cs, _ in self.night_clusters]
+
+        # Periodicidad: lejos de feriados y overrides, el calendario se repite
+        # cada `period` días (múltiplo de 7 para que coincidan los días de la
+        # semana). Un día es irregular si es feriado o su turno no es el
+        # habitual de su residuo; una ventana sin días irregulares tiene las
+        # mismas estadísticas que cualquier otra del mismo residuo y largo.
+        if period and period % 7 == 0 and self.n >= 2 * period:
+            self.period = period
+        else:
+            self.period = 0
+        irregular = list(features.holiday)
+        if self.period:
+            usual = []
+            for r in range(self.period):
+                kinds = features.kinds[r :: self.period]
+                usual.append(max(set(kinds), key=kinds.count))
+            irregular = [
+                h or k != usual[i % self.period]
+                for i, (h, k) in enumerate(zip(features.holiday, features.kinds))
+            ]
+        self._irregular = _prefix(irregular)
+        self._regular_starts: dict[int, np.ndarray] = {}
+
+    def regular_starts(self, length: int) -> np.ndarray:
+        """Marcas por inicio i <= n - length: la ventana [i, i + length) es regular"""
+        regular = self._regular_starts.get(length)
+        if regular is None:
+            irregular = np.asarray(self._irregular)
+            regular = irregular[length:] == irregular[: len(irregular) - length]
+            self._regular_starts[length] = regular
+        return regular
+
+    def position(self, strategy: str, unit: int, length: int, start: int) -> int:
+        """
+        Posición de un candidato en el orden de generación de siempre:
+        estrategia (orden de registro), unidad (inicio, feriado o cluster),
+        largo e inicio. Entre ventanas con el mismo score y largo gana la
+        generada primero.
+        """
+        n = self.n + 1
+        rank = _STRATEGY_RANK[strategy]
+        return ((rank * n + unit) * (self.max_win + 1) + length) * n + start
+
+    def work_around(self, start: int, end: int | None = None) -> int:
+        """Días de trabajo en [start, end) recortado al rango; por defecto min_win días"""
+        if end is None:
+            end = start + self.min_win
+        return self.stats.vac_needed(max(0, start), min(self.n, max(0, end)))
+
+    def nominal_lengths(self, start: int, end: int) -> range:
+        """
+        Largos nominales que pueden producir la ventana [start, end]: las
+        ventanas ancladas se recortan al final del rango, así que si `end` es
+        el último día cualquier largo mayor también termina ahí.
+        """
+        actual = end - start + 1
+        if actual < self.min_win or actual > self.max_win:
+            return range(0)
+        if end < self.n - 1:
+            return range(actual, actual + 1)
+        return range(actual, self.max_win + 1)
+
+
+def _candidate(ctx, strategy, unit, start, end, length, vac_needed, score, reason):
+    """
+    Candidato liviano; el dict de respuesta se arma solo para los elegidos.
+
+    La tupla es (score, largo, -posición, inicio, fin, vacaciones, estrategia,
+    factores): los tres primeros campos son la clave del ranking (mayor es
+    mejor), así que el candidato se compara y se guarda en los heaps tal cual,
+    sin envoltorios. La posición (SuggestionContext.position) reproduce el
+    orden estable de siempre entre empates. `reason` son los factores
+    numéricos del texto explicativo, que se formatea recién en _suggestion.
+    El score se redondea aquí porque es la clave del ranking (dos ventanas
+    con el mismo score mostrado empatan).
+    """
+    return (
+        round(score, 2),
+        length,
+        -ctx.position(strategy, unit, length, start),
+        start,
+        end,
+        vac_needed,
+        strategy,
+        reason,
+    )
+
+
+def _reason_text(strategy: str, reason) -> str:
+    """Texto explicativo a partir de los factores crudos del candidato"""
+    if strategy == "max_consecutive":
+        total_free, segments, nights = reason
+        return f"Maximiza {total_free} días libres consecutivos + {segments} segmentos + evita {nights} noches"
+    if strategy == "holiday_optimization":
+        hol, center, nights = reason
+        return f"Optimiza {hol} feriados (centrado: {center:.1f}) + evita {nights} noches"
+    if strategy == "minimize_work_loss":
+        nights, day_shifts, edges = reason
+        return f"Evita {nights} noches + {day_shifts} días + {edges} puentes"
+    if strategy == "bridge_optimization":
+        edges, bonus = reason
+        return f"Crea {edges} puentes + {bonus:.1f} bonus"
+    if strategy == "seasonal_optimization":
+        (bonus,) = reason
+        return f"Temporada preferida + {bonus:.1f} bonus"
+    coverage, cluster_len = reason
+    return f"Analiza patrón: cubre {coverage}/{cluster_len} noches del cluster"
+
+
+def _suggestion(ctx, cand) -> dict:
+    score, length, _, start, end, vac_needed, strategy, reason = cand
+    stats = ctx.stats
+    return {
+        "start": ctx.features.dates[start],
+        "end": ctx.features.dates[end],
+        "len": length,
+        "used": vac_needed,
+        "holCount": stats.holidays(start, end + 1),
+        "irrCount": stats.irrenunciables(start, end + 1),
+        "score": score,
+        "strategy": strategy,
+        "ai_reason": _reason_text(strategy, reason),
+    }
+
+
+def _grid_windows(ctx, evaluate, lo=0, hi=None):
+    """Recorre las ventanas completas con inicio en [lo, hi) en orden (inicio, largo)"""
+    n = ctx.n
+    for i in range(lo, n if hi is None else min(hi, n)):
+        for length in range(ctx.min_win, ctx.max_win + 1):
+            if i + length - 1 >= n:
+                break
+            cand = evaluate(ctx, i, length)
+            if cand is not None:
+                yield cand
+
+
+# Estrategia 1: Maximizar días libres consecutivos (Optimizada)
+def _eval_max_consecutive(ctx, i, length):
+    stats = ctx.stats
+    j = i + length
+    vac_needed = stats.vac_needed(i, j)
+    if not (vac_needed <= ctx.vac_budget and vac_needed > 0):
+        return None
+
+    night_shifts_avoided = stats.nights(i, j)
+    total_free_days = length - vac_needed
+    # El contador de días consecutivos nunca se reinicia,
+    # por lo que equivale al total de días libres
+    max_consecutive = total_free_days
+    # Cantidad de tramos libres y bonus cúbico para preferir segmentos largos
+    segment_count, segment_bonus = stats.free_segments(i, j)
+
+    # Score mejorado con múltiples factores
+    free_ratio = total_free_days / length
+    efficiency_bonus = (length - vac_needed) / length  # Eficiencia de vacaciones
+    night_shift_bonus = night_shifts_avoided * 2  # Bonus por evitar noches
+
+    score = (
+        (length * 2 + segment_bonus + max_consecutive * 4 + night_shift_bonus)
+        / max(1, vac_needed)
+        * (1 + free_ratio + efficiency_bonus)
+    )
+    return _candidate(
+        ctx, "max_consecutive", i, i, j - 1, length, vac_needed, score,
+        (max_consecutive, segment_count, night_shifts_avoided),
+    )
+
+
+# Estrategia 2: Optimizar alrededor de feriados (Optimizada)
+def _eval_holiday(ctx, start_idx, end_idx, length, k):
+    stats = ctx.stats
+    holiday_idx = ctx.holiday_idx[k]
+    vac_needed = stats.vac_needed(start_idx, end_idx + 1)
+    if not (vac_needed <= ctx.vac_budget and vac_needed > 0):
+        return None
+
+    hol_count = stats.holidays(start_idx, end_idx + 1)
+    night_shifts_around_holiday = stats.nights(start_idx, end_idx + 1)
+    # Bonus extra si el feriado está en el centro de la ventana
+    holiday_center_bonus = 0
+    if start_idx <= holiday_idx <= end_idx:
+        center_distance = abs(holiday_idx - start_idx - length // 2)
+        holiday_center_bonus = max(0, 5 - center_distance) * 2
+
+    # Score mejorado con múltiples factores
+    holiday_bonus = hol_count * 3.0 + holiday_center_bonus
+    free_days = length - vac_needed
+    efficiency_bonus = (length - vac_needed) / length
+    night_shift_bonus = night_shifts_around_holiday * 2
+
+    score = (
+        (length * 1.5 + holiday_bonus + free_days + night_shift_bonus)
+        / max(1, vac_needed)
+        * (1 + efficiency_bonus)
+    )
+    return _candidate(
+        ctx, "holiday_optimization", k, start_idx, end_idx, length, vac_needed, score,
+        (hol_count, holiday_center_bonus, night_shifts_around_holiday),
+    )
+
+
+def _holiday_range(ctx, start, length) -> range:
+    """Feriados (por número) que generan la ventana (inicio, largo) con algún desplazamiento"""
+    lo = bisect_left(ctx.holiday_idx, start - length // 2)
+    hi = bisect_right(ctx.holiday_idx, start + (length + 1) // 2)
+    return range(lo, hi)
+
+
+def _holiday_anchor(ctx, start, end, length):
+    """
+    Entre los feriados que generan la ventana (inicio, largo), el de mayor
+    bonus de centrado (y por lo tanto mayor score); None si ninguno la genera.
+    """
+    holidays = _holiday_range(ctx, start, length)
+    if not holidays:
+        return None
+    # El de mayor bonus es el más cercano al centro dentro de la ventana
+    center = start + length // 2
+
+    def distance(k):
+        h = ctx.holiday_idx[k]
+        return abs(h - center) if start <= h <= end else length
+
+    return min(holidays, key=distance)
+
+
+def _holiday_windows(ctx, lo=0, hi=None):
+    """
+    Ventanas alrededor de los feriados [lo, hi). Cada ventana (inicio, largo)
+    se evalúa una sola vez: la genera el primer feriado que la alcanza y se
+    puntúa con el feriado mejor centrado.
+    """
+    n = ctx.n
+    holidays = ctx.holiday_idx
+    for k in range(lo, len(holidays) if hi is None else min(hi, len(holidays))):
+        holiday_idx = holidays[k]
+        for length in range(ctx.min_win, ctx.max_win + 1):
+            # Inicios de ventana desplazados hasta la mitad del largo, sin
+            # los que ya generó el feriado anterior ni los recortados a 0
+            first = max(0, holiday_idx - (length + 1) // 2)
+            if k > 0:
+                first = max(first, holidays[k - 1] + length // 2 + 1)
+            last = min(n - 1, holiday_idx + length // 2)
+
+            for start_idx in range(first, last + 1):
+                end_idx = min(n - 1, start_idx + length - 1)
+
+                if end_idx - start_idx + 1 < ctx.min_win:
+                    continue
+
+                anchor = _holiday_anchor(ctx, start_idx, end_idx, length)
+                cand = _eval_holiday(ctx, start_idx, end_idx, length, anchor)
+                if cand is not None:
+                    yield cand
+
+
+def _holiday_sequence(ctx, start, end):
+    cands = []
+    for length in ctx.nominal_lengths(start, end):
+        for k in _holiday_range(ctx, start, length):
+            cand = _eval_holiday(ctx, start, end, length, k)
+            if cand is not None:
+                cands.append(cand)
+    # En el orden de los loops: feriado, largo
+    cands.sort(key=itemgetter(2), reverse=True)
+    return cands
+
+
+# Estrategia 3: Minimizar días de trabajo sacrificados (Optimizada)
+def _eval_minimize_work_loss(ctx, i, length):
+    stats = ctx.stats
+    j = i + length
+    vac_needed = stats.vac_needed(i, j)
+    if not (vac_needed <= ctx.vac_budget and vac_needed > 0):
+        return None
+
+    night_shifts_avoided = stats.nights(i, j)
+    day_shifts_avoided = stats.day_shifts(i, j)
+    # Más peso a turnos de noche que a turnos de día
+    work_days_saved = night_shifts_avoided * 4 + day_shifts_avoided
+    # Bonus por conectar con fines de semana (viernes o lunes)
+    weekend_connections = stats.weekend_edges(i, j)
+    # Penalizar secuencias largas de trabajo
+    consecutive_work_penalty = stats.work_pairs(i, j) * 0.3
+
+    # Score mejorado con análisis de patrones
+    base_score = length * 1.5 + work_days_saved
+    pattern_bonus = night_shifts_avoided * 3  # Bonus extra por evitar noches
+    weekend_bonus = weekend_connections * 2  # Bonus por puentes
+    efficiency_bonus = (length - vac_needed) / length
+
+    final_score = (
+        (base_score + pattern_bonus + weekend_bonus - consecutive_work_penalty)
+        / max(1, vac_needed)
+        * (1 + efficiency_bonus)
+    )
+    return _candidate(
+        ctx, "minimize_work_loss", i, i, j - 1, length, vac_needed, final_score,
+        (night_shifts_avoided, day_shifts_avoided, weekend_connections),
+    )
+
+
+# Estrategia 4: Optimización de puentes (Mejorada)
+def _eval_bridge(ctx, i, length):
+    stats = ctx.stats
+    j = i + length
+    vac_needed = stats.vac_needed(i, j)
+    if not vac_needed <= ctx.vac_budget:
+        return None
+
+    # Bonus por crear puentes: viernes/lunes valen 2, jueves/martes 1
+    weekend_connections = stats.weekend_edges(i, j)
+    bridge_bonus = weekend_connections * 2.0 + stats.bridge_days(i, j)
+
+    # Score mejorado con análisis de conexiones de fin de semana
+    bridge_score = (length + bridge_bonus + weekend_connections * 1.5) / max(
+        1, vac_needed
+    )
+    return _candidate(
+        ctx, "bridge_optimization", i, i, j - 1, length, vac_needed, bridge_score,
+        (weekend_connections, bridge_bonus),
+    )
+
+
+# Estrategia 5: Optimización de temporadas (Optimizada)
+def _eval_seasonal(ctx, i, length):
+    stats = ctx.stats
+    j = i + length
+    vac_needed = stats.vac_needed(i, j)
+    if not vac_needed <= ctx.vac_budget:
+        return None
+
+    # Temporadas preferidas (verano, navidad, etc.)
+    seasonal_bonus = stats.seasonal(i, j)
+
+    # Score con bonus de temporada
+    seasonal_score = (length + seasonal_bonus) / max(1, vac_needed)
+    return _candidate(
+        ctx, "seasonal_optimization", i, i, j - 1, length, vac_needed, seasonal_score,
+        (seasonal_bonus,),
+    )
+
+
+# Estrategia 6: Análisis inteligente de patrones de turnos (Optimizada)
+def _eval_pattern(ctx, start_idx, end_idx, length, c):
+    stats = ctx.stats
+    cluster_start, cluster_end = ctx.night_clusters[c]
+    vac_needed = stats.vac_needed(start_idx, end_idx + 1)
+    # Noches de la ventana que pertenecen al cluster original
+    cover_start = max(start_idx, cluster_start)
+    cover_end = min(end_idx, cluster_end)
+    cluster_coverage = (
+        stats.nights(cover_start, cover_end + 1) if cover_start <= cover_end else 0
+    )
+    if not (vac_needed <= ctx.vac_budget and vac_needed > 0 and cluster_coverage > 0):
+        return None
+
+    night_shifts_in_window = stats.nights(start_idx, end_idx + 1)
+    # Score basado en cobertura del cluster y eficiencia
+    cluster_bonus = cluster_coverage * 3  # Bonus por cubrir noches del cluster
+    efficiency_bonus = (length - vac_needed) / length
+    night_avoidance_bonus = night_shifts_in_window * 2
+
+    score = (
+        (length * 1.5 + cluster_bonus + night_avoidance_bonus)
+        / max(1, vac_needed)
+        * (1 + efficiency_bonus)
+    )
+    return _candidate(
+        ctx, "pattern_analysis", c, start_idx, end_idx, length, vac_needed, score,
+        (cluster_coverage, cluster_end - cluster_start + 1),
+    )
+
+
+def _cluster_range(ctx, start, length) -> range:
+    """Clusters (por número) que generan la ventana (inicio, largo) con algún desplazamiento"""
+    lo = bisect_left(ctx.cluster_starts, start - length // 3)
+    hi = bisect_right(ctx.cluster_starts, start + (length + 2) // 3)
+    return range(lo, hi)
+
+
+def _pattern_windows(ctx, lo=0, hi=None):
+    """
+    Ventanas alrededor de los clusters de noches [lo, hi). Como con los
+    feriados, cada ventana (inicio, largo) se evalúa una sola vez: la genera
+    el primer cluster que la alcanza y se puntúa con el que más la favorece.
+    """
+    n = ctx.n
+    clusters = ctx.cluster_starts
+    for c in range(lo, len(clusters) if hi is None else min(hi, len(clusters))):
+        for length in range(ctx.min_win, ctx.max_win + 1):
+            # Inicios desplazados hasta un tercio del largo, sin los que ya
+            # generó el cluster anterior ni los recortados a 0
+            first = max(0, clusters[c] - (length + 2) // 3)
+            if c > 0:
+                first = max(first, clusters[c - 1] + length // 3 + 1)
+            last = min(n - 1, clusters[c] + length // 3)
+
+            for start_idx in range(first, last + 1):
+                end_idx = min(n - 1, start_idx + length - 1)
+
+                if end_idx - start_idx + 1 < ctx.min_win:
+                    continue
+
+                best = None
+                for other in _cluster_range(ctx, start_idx, length):
+                    cand = _eval_pattern(ctx, start_idx, end_idx, length, other)
+                    if cand is not None and (best is None or cand[0] > best[0]):
+                        best = cand
+                if best is not None:
+                    yield best
+
+
+def _pattern_sequence(ctx, start, end):
+    cands = []
+    for length in ctx.nominal_lengths(start, end):
+        for c in _cluster_range(ctx, start, length):
+            cand = _eval_pattern(ctx, start, end, length, c)
+            if cand is not None:
+                cands.append(cand)
+    # En el orden de los loops: cluster, largo
+    cands.sort(key=itemgetter(2), reverse=True)
+    return cands
+
+
+# ====== REGISTRO DE ESTRATEGIAS ======
+
+
+class Strategy(ABC):
+    """
+    Estrategia de sugerencias sobre las estadísticas de ventana del contexto.
+
+    `windows` genera los candidatos en orden, una vez por ventana (inicio,
+    largo) y con su mejor score, limitado a las unidades [lo, hi) de `units`
+    (inicios de ventana, feriados o clusters) para poder repartir la
+    estrategia entre procesos. `sequence` devuelve todos los candidatos que
+    la estrategia da a una ventana (inicio, fin), uno por unidad y largo, en
+    el orden de sus loops.
+    """
+
+    name = ""
+
+    @abstractmethod
+    def windows(self, ctx: SuggestionContext, lo: int = 0, hi: int | None = None):
+        ...
+
+    @abstractmethod
+    def sequence(self, ctx: SuggestionContext, start: int, end: int) -> list[tuple]:
+        ...
+
+    def first_position(self, ctx: SuggestionContext, start: int, end: int) -> int | None:
+        """
+        Cota inferior de la posición de los candidatos que da a la ventana
+        (inicio, fin), o None si no le da ninguno. Las subclases la calculan
+        sin evaluar la ventana.
+        """
+        cands = self.sequence(ctx, start, end)
+        return -cands[0][2] if cands else None
+
+    @abstractmethod
+    def units(self, ctx: SuggestionContext) -> int:
+        ...
+
+    def priority(self, ctx: SuggestionContext, unit: int) -> tuple:
+        """Orden de búsqueda del modo con plazo (menor = más prometedora)"""
+        return (0, 0, unit)
+
+    def estimated_windows(self, ctx: SuggestionContext) -> int:
+        """Ventanas que evaluará la estrategia (para ordenar por costo)"""
+        return self.units(ctx) * max(0, ctx.max_win - ctx.min_win + 1)
+
+    def window_classes(self, ctx: SuggestionContext, lo: int = 0, hi=None):
+        """
+        Candidatos agrupados en clases de ventanas equivalentes: tríos
+        (candidato, inicios, ventanas) donde `inicios` recorre en orden los
+        inicios de ventanas con el mismo score y largo, o es None si el
+        candidato es único, y `ventanas` es el tamaño de la clase.
+        """
+        for cand in self.windows(ctx, lo, hi):
+            yield cand, None, 1
+
+
+class GridStrategy(Strategy):
+    """
+    Evalúa todas las ventanas completas (inicio, largo) del rango. Si el score
+    solo depende del turno, el día de la semana y los feriados (`periodic`),
+    las ventanas regulares se evalúan una vez por residuo del período.
+    """
+
+    def __init__(self, name: str, evaluate, periodic: bool = False):
+        self.name = name
+        self.evaluate = evaluate
+        self.periodic = periodic
+
+    def window_classes(self, ctx, lo=0, hi=None):
+        n = ctx.n
+        hi = n if hi is None else min(hi, n)
+        period = ctx.period
+        # En rangos de menos de un período cada clase tiene una sola ventana
+        if not self.periodic or not period or hi - lo < period:
+            yield from super().window_classes(ctx, lo, hi)
+            return
+
+        for length in range(ctx.min_win, ctx.max_win + 1):
+            stop = min(hi, n - length + 1)
+            if stop <= lo:
+                break
+            regular = ctx.regular_starts(length)[lo:stop]
+
+            # Las ventanas con días irregulares se evalúan una a una
+            for i in np.flatnonzero(~regular).tolist():
+                cand = self.evaluate(ctx, lo + i, length)
+                if cand is not None:
+                    yield cand, None, 1
+
+            # Las regulares, una vez por residuo: filas de `period` inicios
+            rows = -(-len(regular) // period)
+            grid = np.zeros(rows * period, dtype=bool)
+            grid[: len(regular)] = regular
+            grid = grid.reshape(rows, period)
+            sizes = np.count_nonzero(grid, axis=0)
+            for residue in np.flatnonzero(sizes).tolist():
+                # La primera ventana regular de la clase representa a todas
+                first = residue + period * int(np.argmax(grid[:, residue]))
+                size = int(sizes[residue])
+                cand = self.evaluate(ctx, lo + first, length)
+                if cand is not None:
+                    starts = (
+                        lo + k
+                        for k in range(first, len(regular), period)
+                        if regular[k]
+                    )
+                    yield cand, starts, size
+
+    def windows(self, ctx, lo=0, hi=None):
+        return _grid_windows(ctx, self.evaluate, lo, hi)
+
+    def sequence(self, ctx, start, end):
+        length = end - start + 1
+        if ctx.min_win <= length <= ctx.max_win and end < ctx.n:
+            cand = self.evaluate(ctx, start, length)
+            if cand is not None:
+                return [cand]
+        return []
+
+    def first_position(self, ctx, start, end):
+        length = end - start + 1
+        if ctx.min_win <= length <= ctx.max_win and end < ctx.n:
+            return ctx.position(self.name, start, length, start)
+        return None
+
+    def units(self, ctx):
+        return ctx.n
+
+    def priority(self, ctx, unit):
+        # Primero los inicios cuya ventana mínima tiene menos días de trabajo
+        # (menos vacaciones, más score); a igualdad, después de feriados y
+        # clusters. Los inicios sin ventanas completas no generan nada: al final
+        if unit + ctx.min_win > ctx.n:
+            return (ctx.n + 1, 1, unit)
+        return (ctx.work_around(unit, unit + ctx.min_win), 1, unit)
+
+
+def _first_anchored(ctx, name, anchors, start, end):
+    """Posición del primer ancla (feriado o cluster) que alcanza la ventana, con cualquier largo"""
+    positions = [
+        ctx.position(name, units[0], length, start)
+        for length in ctx.nominal_lengths(start, end)
+        if (units := anchors(ctx, start, length))
+    ]
+    return min(positions, default=None)
+
+
+class HolidayStrategy(Strategy):
+    """Ventanas alrededor de cada feriado"""
+
+    name = "holiday_optimization"
+
+    def windows(self, ctx, lo=0, hi=None):
+        return _holiday_windows(ctx, lo, hi)
+
+    def sequence(self, ctx, start, end):
+        return _holiday_sequence(ctx, start, end)
+
+    def first_position(self, ctx, start, end):
+        return _first_anchored(ctx, self.name, _holiday_range, start, end)
+
+    def units(self, ctx):
+        return len(ctx.holiday_idx)
+
+    def priority(self, ctx, unit):
+        center = ctx.holiday_idx[unit]
+        return (ctx.work_around(center - ctx.min_win // 2), 0, unit)
+
+    def estimated_windows(self, ctx):
+        # Desplazamientos de hasta la mitad del largo a cada lado
+        lengths = range(ctx.min_win, ctx.max_win + 1)
+        return self.units(ctx) * sum(length + 1 for length in lengths)
+
+
+class PatternStrategy(Strategy):
+    """Ventanas alrededor de cada cluster de noches"""
+
+    name = "pattern_analysis"
+
+    def windows(self, ctx, lo=0, hi=None):
+        return _pattern_windows(ctx, lo, hi)
+
+    def sequence(self, ctx, start, end):
+        return _pattern_sequence(ctx, start, end)
+
+    def first_position(self, ctx, start, end):
+        return _first_anchored(ctx, self.name, _cluster_range, start, end)
+
+    def units(self, ctx):
+        return len(ctx.night_clusters)
+
+    def priority(self, ctx, unit):
+        return (ctx.work_around(ctx.cluster_starts[unit] - ctx.min_win // 3), 0, unit)
+
+    def estimated_windows(self, ctx):
+        # Desplazamientos de hasta un tercio del largo a cada lado
+        lengths = range(ctx.min_win, ctx.max_win + 1)
+        return self.units(ctx) * sum(2 * length // 3 + 1 for length in lengths)
+
+
+# Estrategias por nombre; el orden de registro es el orden de ejecución y
+# el de generación que desempata sugerencias con el mismo score y largo
+STRATEGY_REGISTRY: dict[str, Strategy] = {}
+# Número de cada estrategia en el orden de registro
+_STRATEGY_RANK: dict[str, int] = {}
+
+
+def register_strategy(strategy: Strategy) -> Strategy:
+    STRATEGY_REGISTRY[strategy.name] = strategy
+    _STRATEGY_RANK.setdefault(strategy.name, len(_STRATEGY_RANK))
+    return strategy
+
+
+register_strategy(
+    GridStrategy("max_consecutive", _eval_max_consecutive, periodic=True)
+)
+register_strategy(HolidayStrategy())
+register_strategy(
+    GridStrategy("minimize_work_loss", _eval_minimize_work_loss, periodic=True)
+)
+register_strategy(GridStrategy("bridge_optimization", _eval_bridge, periodic=True))
+# El bonus de temporada depende del mes: no se repite con el patrón
+register_strategy(GridStrategy("seasonal_optimization", _eval_seasonal))
+register_strategy(PatternStrategy())
+
+
+def resolve_strategies(names=None) -> list[Strategy]:
+    """
+    Estrategias pedidas por nombre, en el orden del registro. Sin nombres
+    devuelve todas; un nombre desconocido o una lista vacía es ValueError.
+    """
+    if names is None:
+        return list(STRATEGY_REGISTRY.values())
+    if isinstance(names, str) or not isinstance(names, (list, tuple)):
+        raise ValueError("strategies debe ser una lista de nombres")
+    if not names:
+        raise ValueError("Debe indicar al menos una estrategia")
+    for name in names:
+        if name not in STRATEGY_REGISTRY:
+            raise ValueError(f"Estrategia inválida: {name}")
+    return [s for name, s in STRATEGY_REGISTRY.items() if name in names]
+
+
+def estimate_suggest_cost(days: int, min_win: int, max_win: int, strategies=None) -> int:
+    """
+    Costo estimado de un request antes de construir el calendario: ventanas
+    (inicio, largo) que cabe evaluar por estrategia. Cada ventana cuesta O(1)
+    con las sumas acumuladas, así que el tiempo crece con este número.
+    """
+    if strategies is None:
+        strategies = resolve_strategies()
+    min_win = max(1, min_win)
+    windows = sum(max(0, days - length + 1) for length in range(min_win, max_win + 1))
+    return windows * len(strategies)
+
+
+def _record(meta: dict | None, name: str, started: float, candidates: int) -> None:
+    """Acumula tiempo (ms) y candidatos generados de una estrategia en `meta`"""
+    if meta is None:
+        return
+    entry = meta.setdefault(name, {"ms": 0.0, "candidates": 0})
+    entry["ms"] = round(entry["ms"] + (time.perf_counter() - started) * 1000, 3)
+    entry["candidates"] += candidates
+
+
+# ====== SELECCIÓN TOP-K ======
+
+
+class SuggestionCollector:
+    """
+    Selección acotada de las mejores sugerencias.
+
+    Cada estrategia tiene un heap de tamaño `per_strategy`. Para un candidato
+    que supera al peor de su heap se repite la regla de deduplicado de
+    siempre sobre su ventana (inicio, fin), con los candidatos que le dan
+    todas las estrategias en orden de generación (`_window_entries`); el
+    candidato aporta las sugerencias resultantes que son de su estrategia y
+    largo. Con eso los heaps contienen exactamente las sugerencias que
+    sobreviven y el top global sale de unirlos.
+    Memoria O(estrategias * per_strategy) en vez de O(ventanas).
+    """
+
+    def __init__(
+        self,
+        ctx: SuggestionContext,
+        strategies=None,
+        limit: int = SUGGESTION_LIMIT,
+        per_strategy: int = PER_STRATEGY_LIMIT,
+    ):
+        self.ctx = ctx
+        self.strategies = resolve_strategies() if strategies is None else strategies
+        self.limit = limit
+        self.per_strategy = per_strategy
+        self.heaps = {s.name: [] for s in self.strategies}
+
+    def _first_position(self, start: int, end: int) -> int | None:
+        """Cota inferior de la posición de las sugerencias de la ventana"""
+        for strategy in self.strategies:
+            position = strategy.first_position(self.ctx, start, end)
+            if position is not None:
+                return position
+        return None
+
+    def _window_entries(self, start: int, end: int, owner=None) -> list[tuple]:
+        """
+        Sugerencias que deja la ventana (inicio, fin) al deduplicar en orden
+        de generación: queda el primer candidato con el mejor score y, si
+        otra estrategia empató al que estaba primero en ese momento, el
+        último de esos empates como alternativa (aunque después lo supere un
+        score mayor). Cada una toma la posición de la primera vez que se
+        guardó su lugar: la ventana al aparecer y la alternativa al empatar.
+
+        Con `owner` = (estrategia, score máximo) solo interesan las
+        sugerencias de esa estrategia: si una estrategia anterior ya superó
+        ese score, la ventana no le deja ninguna y se corta ahí.
+        """
+        main = alt = None
+        for strategy in self.strategies:
+            if owner is not None and main is not None and main[0] > owner[1]:
+                return []
+            if owner is not None and strategy.name == owner[0]:
+                owner = None
+            for cand in strategy.sequence(self.ctx, start, end):
+                if main is None:
+                    main, position = cand, cand[2]
+                elif cand[0] > main[0]:
+                    main = cand
+                elif cand[0] == main[0] and cand[6] != main[6]:
+                    if alt is None:
+                        alt_position = cand[2]
+                    alt = cand
+        if main is None:
+            return []
+        entries = [main[:2] + (position,) + main[3:]]
+        if alt is not None:
+            entries.append(alt[:2] + (alt_position,) + alt[3:])
+        return entries
+
+    def offer(self, entry: tuple) -> None:
+        """Guarda una sugerencia ya deduplicada si entra en el heap de su estrategia"""
+        heap = self.heaps[entry[6]]
+        if len(heap) < self.per_strategy:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+
+    def add(self, cand: tuple) -> bool:
+        """
+        Ofrece un candidato. Devuelve False si no alcanza el umbral de su heap
+        y True si se revisó su ventana.
+        """
+        heap = self.heaps[cand[6]]
+        _, length, _, start, end, _, strategy, _ = cand
+        if len(heap) >= self.per_strategy:
+            # Las sugerencias que aporta tienen su largo y a lo más su score:
+            # si no alcanzan al peor del heap se descarta sin revisar la ventana
+            if cand[:2] < heap[0][:2]:
+                return False
+            # Con el mismo score y largo decide la posición, que no puede ser
+            # anterior a la del primer candidato posible de la ventana
+            if cand[:2] == heap[0][:2] and self._first_position(start, end) >= -heap[0][2]:
+                return True
+
+        for entry in self._window_entries(start, end, (strategy, cand[0])):
+            if entry[6] == strategy and entry[1] == length:
+                self.offer(entry)
+        return True
+
+    def add_class(self, cand: tuple, starts) -> None:
+        """
+        Ofrece una clase de ventanas equivalentes en orden de inicio. Todas
+        tienen el mismo score y largo, así que en cuanto una no alcanza el
+        umbral del heap tampoco lo alcanzan las siguientes.
+        """
+        score, length, _, first, _, vac_needed, strategy, reason = cand
+        position = self.ctx.position
+        for start in starts:
+            if start != first:
+                cand = (
+                    score,
+                    length,
+                    -position(strategy, start, length, start),
+                    start,
+                    start + length - 1,
+                    vac_needed,
+                    strategy,
+                    reason,
+                )
+            if not self.add(cand):
+                break
+
+    def run(self, strategy: Strategy, lo: int = 0, hi: int | None = None) -> int:
+        """Recorre las unidades [lo, hi) de la estrategia; devuelve ventanas evaluadas"""
+        count = 0
+        for cand, starts, windows in strategy.window_classes(self.ctx, lo, hi):
+            if starts is None:
+                self.add(cand)
+            else:
+                self.add_class(cand, starts)
+            count += windows
+        return count
+
+    def strategy_results(self, name: str) -> list[dict]:
+        """Sugerencias retenidas de una estrategia, de mejor a peor"""
+        top = sorted(self.heaps[name], reverse=True)
+        return [_suggestion(self.ctx, cand) for cand in top]
+
+    def candidates(self) -> list[tuple]:
+        """Candidatos retenidos, sin armar (para combinar colectores)"""
+        return [cand for heap in self.heaps.values() for cand in heap]
+
+    def results(self) -> list[dict]:
+        """Top global: las mejores de todos los heaps, ya diversificadas"""
+        entries = [cand for heap in self.heaps.values() for cand in heap]
+        top = heapq.nlargest(self.limit, entries)
+        return [_suggestion(self.ctx, cand) for cand in top]
+
+
+def classic_suggestions(
+    ctx: SuggestionContext, strategies=None, meta: dict | None = None
+) -> list[dict]:
+    """
+    Ejecuta las estrategias en orden y devuelve las mejores sugerencias. Si se
+    pasa `meta`, se llena con el tiempo y los candidatos de cada estrategia.
+    """
+    collector = SuggestionCollector(ctx, strategies)
+    for strategy in collector.strategies:
+        started = time.perf_counter()
+        _record(meta, strategy.name, started, collector.run(strategy))
+    return collector.results()
+
+
+def stream_suggestions(ctx: SuggestionContext, strategies=None, meta: dict | None = None):
+    """
+    Genera ("strategy", nombre, sugerencias) apenas termina cada estrategia,
+    de la más barata a la más cara, y al final ("final", None, sugerencias).
+
+    Las sugerencias de una estrategia ya son definitivas al terminarla: el
+    deduplicado consulta a todas las estrategias por cada ventana, así que
+    las que corren después no pueden sacarlas de su heap.
+    """
+    collector = SuggestionCollector(ctx, strategies)
+    by_cost = sorted(collector.strategies, key=lambda s: s.estimated_windows(ctx))
+    for strategy in by_cost:
+        started = time.perf_counter()
+        _record(meta, strategy.name, started, collector.run(strategy))
+        yield "strategy", strategy.name, collector.strategy_results(strategy.name)
+    yield "final", None, collector.results()
+
+
+def deadline_suggestions(
+    ctx: SuggestionContext,
+    deadline: float,
+    strategies=None,
+    meta: dict | None = None,
+) -> tuple[list[dict], dict]:
+    """
+    Modo con plazo: recorre las unidades de todas las estrategias de la más a
+    la menos prometedora (ventanas de feriados y clusters de noches primero)
+    y se detiene al alcanzar `deadline` (valor de time.perf_counter), después
+    de evaluar al menos la unidad más prometedora de cada estrategia.
+
+    Devuelve las mejores sugerencias encontradas y la cobertura: fracción de
+    unidades evaluadas, total y por estrategia, y si el resultado es parcial.
+    Si alcanza a recorrer todo, el resultado es el mismo de classic_suggestions.
+    """
+    collector = SuggestionCollector(ctx, strategies)
+    totals = {s.name: s.units(ctx) for s in collector.strategies}
+    done = dict.fromkeys(totals, 0)
+    if meta is not None:
+        # También las estrategias sin unidades, que nunca llegan a ejecutarse
+        for name in totals:
+            meta.setdefault(name, {"ms": 0.0, "candidates": 0})
+    order = sorted(
+        (strategy.priority(ctx, unit), rank, unit)
+        for rank, strategy in enumerate(collector.strategies)
+        for unit in range(totals[strategy.name])
+    )
+    # La unidad más prometedora de cada estrategia se evalúa siempre, aunque
+    # el plazo ya haya vencido, para no devolver una respuesta vacía
+    heads = {}
+    for entry in order:
+        heads.setdefault(entry[1], entry)
+    first = sorted(heads.values())
+    order = first + [entry for entry in order if heads[entry[1]] is not entry]
+
+    partial = False
+    for position, (_, rank, unit) in enumerate(order):
+        if position >= len(first) and time.perf_counter() >= deadline:
+            partial = True
+            break
+        strategy = collector.strategies[rank]
+        started = time.perf_counter()
+        count = collector.run(strategy, unit, unit + 1)
+        _record(meta, strategy.name, started, count)
+        done[strategy.name] += 1
+
+    evaluated, total = sum(done.values()), sum(totals.values())
+    coverage = {
+        "partial": partial,
+        "ratio": round(evaluated / total, 4) if total else 1.0,
+        "strategies": {
+            name: round(done[name] / totals[name], 4) if totals[name] else 1.0
+            for name in totals
+        },
+    }
+    return collector.results(), coverage
+
+
+# ====== EJECUCIÓN EN PARALELO ======
+# El generador de cada estrategia se divide en rangos de unidades (inicios de
+# ventana, feriados o clusters) y cada proceso recolecta su propio top-k. Como
+# el deduplicado consulta a todas las estrategias para la ventana, cada parte
+# es exacta y basta juntar sus sugerencias en un colector.
+
+_pool = None
+_pool_size = 0
+_pool_lock = threading.Lock()
+
+
+def _get_pool(size: int) -> ProcessPoolExecutor:
+    """
+    Pool de procesos reutilizable entre requests, creado al primer uso.
+
+    Los procesos no se crean con fork: el servidor tiene hilos (warm-up de
+    feriados, gunicorn) y un fork copiaría locks tomados. Con forkserver o
+    spawn cada proceso importa el módulo de cero y registra las estrategias.
+    """
+    global _pool, _pool_size
+    with _pool_lock:
+        if _pool is None or _pool_size != size:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            methods = multiprocessing.get_all_start_methods()
+            method = "forkserver" if "forkserver" in methods else "spawn"
+            _pool = ProcessPoolExecutor(
+                max_workers=size, mp_context=multiprocessing.get_context(method)
+            )
+            _pool_size = size
+        return _pool
+
+
+def _discard_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+            _pool = None
+
+
+def _collect_part(
+    features, vacation_calculation, vac_budget, min_win, max_win, period, names, part
+):
+    """Tarea de un proceso: recorre sus rangos y devuelve los candidatos retenidos"""
+    ctx = SuggestionContext(
+        features, vacation_calculation, vac_budget, min_win, max_win, period
+    )
+    collector = SuggestionCollector(ctx, resolve_strategies(names))
+    meta = {}
+    for name, lo, hi in part:
+        started = time.perf_counter()
+        _record(meta, name, started, collector.run(STRATEGY_REGISTRY[name], lo, hi))
+    return collector.candidates(), meta
+
+
+def parallel_suggestions(
+    ctx: SuggestionContext,
+    pool_size: int = 0,
+    min_work: int = 0,
+    strategies=None,
+    meta: dict | None = None,
+) -> list[dict]:
+    """
+    Igual que classic_suggestions pero repartiendo las ventanas en un pool de
+    procesos. Con rangos pequeños (menos de `min_work` ventanas por
+    estrategia) o un solo proceso se ejecuta en el mismo proceso. En `meta`
+    el tiempo de cada estrategia es la suma de todos los procesos.
+    """
+    strategies = resolve_strategies() if strategies is None else strategies
+    workers = pool_size or os.cpu_count() or 1
+    work = ctx.n * max(0, ctx.max_win - ctx.min_win + 1)
+    if workers < 2 or work < min_work:
+        return classic_suggestions(ctx, strategies, meta)
+
+    # Cada proceso recibe una porción contigua de cada estrategia
+    parts = [[] for _ in range(workers)]
+    for strategy in strategies:
+        total = strategy.units(ctx)
+        for k in range(workers):
+            lo, hi = total * k // workers, total * (k + 1) // workers
+            if lo < hi:
+                parts[k].append((strategy.name, lo, hi))
+
+    args = (
+        ctx.features,
+        ctx.vacation_calculation,
+        ctx.vac_budget,
+        ctx.min_win,
+        ctx.max_win,
+        ctx.period,
+        [s.name for s in strategies],
+    )
+    try:
+        pool = _get_pool(workers)
+        futures = [pool.submit(_collect_part, *args, part) for part in parts if part]
+        chunks = [future.result() for future in futures]
+    except BrokenProcessPool:
+        # Un proceso murió: se descarta el pool y se calcula aquí
+        _discard_pool()
+        return classic_suggestions(ctx, strategies, meta)
+
+    collector = SuggestionCollector(ctx, strategies)
+    if meta is not None:
+        # También las estrategias sin unidades, que ningún proceso recorrió
+        for strategy in strategies:
+            meta.setdefault(strategy.name, {"ms": 0.0, "candidates": 0})
+    for chunk, part_meta in chunks:
+        for entry in chunk:
+            collector.offer(entry)
+        if meta is not None:
+            for name, entry in part_meta.items():
+                total = meta[name]
+                total["ms"] = round(total["ms"] + entry["ms"], 3)
+                total["candidates"] += entry["candidates"]
+    return collector.results()
+
+
+# ====== MOTOR VECTORIZADO ======
+# Evalúa todas las ventanas (inicio, largo) de cada estrategia como operaciones
+# sobre arreglos de NumPy. Reproduce los mismos scores, el mismo deduplicado por
+# (inicio, fin), el mismo orden entre empates y la misma regla de diversidad
+# que el motor clásico.
+
+
+class _VectorData:
+    """Arreglos y sumas acumuladas de NumPy para un request"""
+
+    def __init__(self, features: DayFeatures, vacation_calculation: str):
+        self.n = n = features.n
+        free = np.asarray(features.free_for(vacation_calculation), dtype=bool)
+        kinds = np.asarray(features.kinds, dtype=np.int8)
+        weekdays = np.asarray(features.weekdays, dtype=np.int8)
+        work = ~free
+
+        def prefix(values):
+            out = np.zeros(n + 1, dtype=values.dtype if values.dtype.kind == "f" else np.int64)
+            np.cumsum(values, out=out[1:])
+            return out
+
+        self.free = free
+        self.work = prefix(work)
+        self.hol = prefix(np.asarray(features.holiday, dtype=bool))
+        self.irr = prefix(np.asarray(features.irrenunciable, dtype=bool))
+        self.nights = prefix(work & (kinds == KIND_NIGHT))
+        self.day_shifts = prefix(work & (kinds == KIND_DAY))
+        self.weekend_edges = prefix(work & ((weekdays == 4) | (weekdays == 0)))
+        self.bridge_days = prefix(work & ((weekdays == 3) | (weekdays == 1)))
+        self.seasonal = prefix(np.where(work, np.asarray(features.seasons), 0.0))
+        pairs = np.zeros(n, dtype=bool)
+        pairs[1:] = work[1:] & work[:-1]
+        self.work_pairs = prefix(pairs)
+
+        # Codificación por tramos (run-length) de días libres/trabajo
+        if n:
+            change = np.flatnonzero(free[1:] != free[:-1]) + 1
+            run_starts = np.concatenate(([0], change))
+            run_ends = np.concatenate((change, [n]))
+        else:
+            run_starts = run_ends = np.zeros(0, dtype=np.int64)
+        run_free = free[run_starts]
+        run_len = run_ends - run_starts
+        self.run_id = np.repeat(np.arange(len(run_starts)), run_len)
+        self.run_starts = run_starts
+        self.run_ends = run_ends
+        # Sumas acumuladas sobre los tramos libres: cantidad y cubos de largos
+        self.run_count = np.zeros(len(run_starts) + 1, dtype=np.int64)
+        np.cumsum(run_free, out=self.run_count[1:])
+        self.run_cubes = np.zeros(len(run_starts) + 1, dtype=np.int64)
+        np.cumsum(np.where(run_free, run_len.astype(np.int64) ** 3, 0), out=self.run_cubes[1:])
+
+        # Índices de feriados y clusters de noches (tramos maximales de "N")
+        self.holiday_idx = np.flatnonzero(np.asarray(features.holiday, dtype=bool))
+        is_night = kinds == KIND_NIGHT
+        if n:
+            edges = np.diff(np.concatenate(([0], is_night.astype(np.int8), [0])))
+            self.cluster_starts = np.flatnonzero(edges == 1)
+            self.cluster_ends = np.flatnonzero(edges == -1) - 1
+        else:
+            self.cluster_starts = self.cluster_ends = np.zeros(0, dtype=np.int64)
+
+    @staticmethod
+    def window(prefix, i, j):
+        """Suma de una ventana [i, j) para arreglos de índices"""
+        return prefix[j] - prefix[i]
+
+    def segments(self, i, j):
+        """Cantidad de tramos libres y suma de sus cubos para ventanas [i, j)"""
+        ri = self.run_id[i]
+        rj = self.run_id[j - 1]
+        head_free = self.free[i]
+        tail_free = self.free[j - 1]
+        same = ri == rj
+
+        head = np.where(head_free, self.run_ends[ri] - i, 0).astype(np.int64)
+        tail = np.where(tail_free, j - self.run_starts[rj], 0).astype(np.int64)
+        inner_count = self.run_count[rj] - self.run_count[np.minimum(ri + 1, rj)]
+        inner_cubes = self.run_cubes[rj] - self.run_cubes[np.minimum(ri + 1, rj)]
+
+        count = np.where(same, head_free.astype(np.int64), inner_count + (head > 0) + (tail > 0))
+        whole = (j - i).astype(np.int64)
+        cubes = np.where(
+            same,
+            np.where(head_free, whole**3, 0),
+            inner_cubes + head**3 + tail**3,
+        )
+        return count, cubes
+
+
+def _grid(data: _VectorData, min_win: int, max_win: int):
+    """Todas las ventanas (i, largo) completas dentro del rango, en orden i-largo"""
+    lengths = np.arange(min_win, max_win + 1)
+    starts = np.arange(data.n)
+    i = np.repeat(starts, len(lengths))
+    length = np.tile(lengths, data.n)
+    keep = i + length <= data.n
+    return i[keep], length[keep]
+
+
+def _vector_max_consecutive(data, i, length, vac_budget):
+    j = i + length
+    vac = data.window(data.work, i, j)
+    ok = (vac <= vac_budget) & (vac > 0)
+    i, j, length, vac = i[ok], j[ok], length[ok], vac[ok]
+    nights = data.window(data.nights, i, j)
+    seg_count, seg_cubes = data.segments(i, j)
+    total_free = length - vac
+    free_ratio = total_free / length
+    efficiency = (length - vac) / length
+    score = (
+        (length * 2 + seg_cubes + total_free * 4 + nights * 2)
+        / np.maximum(1, vac)
+        * (1 + free_ratio + efficiency)
+    )
+    return {
+        "start": i, "end": j - 1, "len": length, "used": vac, "score": score,
+        "unit": i, "reason": (total_free, seg_count, nights),
+    }
+
+
+def _vector_minimize_work_loss(data, i, length, vac_budget):
+    j = i + length
+    vac = data.window(data.work, i, j)
+    ok = (vac <= vac_budget) & (vac > 0)
+    i, j, length, vac = i[ok], j[ok], length[ok], vac[ok]
+    nights = data.window(data.nights, i, j)
+    day_shifts = data.window(data.day_shifts, i, j)
+    edges = data.window(data.weekend_edges, i, j)
+    pairs = np.where(length >= 2, data.work_pairs[j] - data.work_pairs[np.minimum(i + 1, j)], 0)
+    base = length * 1.5 + (nights * 4 + day_shifts)
+    efficiency = (length - vac) / length
+    score = (
+        (base + nights * 3 + edges * 2 - pairs * 0.3)
+        / np.maximum(1, vac)
+        * (1 + efficiency)
+    )
+    return {
+        "start": i, "end": j - 1, "len": length, "used": vac, "score": score,
+        "unit": i, "reason": (nights, day_shifts, edges),
+    }
+
+
+def _vector_bridge(data, i, length, vac_budget):
+    j = i + length
+    vac = data.window(data.work, i, j)
+    ok = vac <= vac_budget
+    i, j, length, vac = i[ok], j[ok], length[ok], vac[ok]
+    edges = data.window(data.weekend_edges, i, j)
+    bonus = edges * 2.0 + data.window(data.bridge_days, i, j)
+    score = (length + bonus + edges * 1.5) / np.maximum(1, vac)
+    return {
+        "start": i, "end": j - 1, "len": length, "used": vac, "score": score,
+        "unit": i, "reason": (edges, bonus),
+    }
+
+
+def _vector_seasonal(data, i, length, vac_budget):
+    j = i + length
+    vac = data.window(data.work, i, j)
+    ok = vac <= vac_budget
+    i, j, length, vac = i[ok], j[ok], length[ok], vac[ok]
+    bonus = data.window(data.seasonal, i, j)
+    score = (length + bonus) / np.maximum(1, vac)
+    return {
+        "start": i, "end": j - 1, "len": length, "used": vac, "score": score,
+        "unit": i, "reason": (bonus,),
+    }
+
+
+def _anchored_windows(anchors, min_win, max_win, n, divisor):
+    """
+    Ventanas alrededor de posiciones ancla (feriados o clusters), en el mismo
+    orden que los loops clásicos: ancla, largo y desplazamiento hasta 1/divisor
+    del largo a cada lado, una vez por (ancla, largo, inicio) aunque varios
+    desplazamientos se recorten al mismo inicio 0.
+    """
+    lengths = np.arange(min_win, max_win + 1)
+    anchors = np.asarray(anchors, dtype=np.int64)
+    a = anchors[:, None]
+    first = np.maximum(0, a - (lengths + divisor - 1) // divisor)
+    last = np.minimum(n - 1, a + lengths // divisor)
+    count = np.maximum(0, last - first + 1).ravel()
+    first = first.ravel()
+    offset = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+    start = np.repeat(first, count) + offset
+    rank = np.repeat(np.repeat(np.arange(len(anchors)), len(lengths)), count)
+    length = np.repeat(np.tile(lengths, len(anchors)), count)
+    end = np.minimum(n - 1, start + length - 1)
+    keep = end - start + 1 >= min_win
+    return rank[keep], start[keep], end[keep], length[keep]
+
+
+def _vector_holiday(data, min_win, max_win, vac_budget):
+    holidays = data.holiday_idx
+    rank, start, end, length = _anchored_windows(holidays, min_win, max_win, data.n, 2)
+    j = end + 1
+    vac = data.window(data.work, start, j)
+    ok = (vac <= vac_budget) & (vac > 0)
+    rank, start, j, length, vac = rank[ok], start[ok], j[ok], length[ok], vac[ok]
+    hol = data.window(data.hol, start, j)
+    nights = data.window(data.nights, start, j)
+
+    # Bonus extra si el feriado está en el centro de la ventana
+    h = holidays[rank]
+    center = np.where(
+        (start <= h) & (h < j), np.maximum(0, 5 - np.abs(h - start - length // 2)) * 2, 0
+    )
+    efficiency = (length - vac) / length
+    score = (
+        (length * 1.5 + (hol * 3.0 + center) + (length - vac) + nights * 2)
+        / np.maximum(1, vac)
+        * (1 + efficiency)
+    )
+    return {
+        "start": start, "end": j - 1, "len": length, "used": vac, "score": score,
+        "unit": rank, "reason": (hol, center, nights),
+    }
+
+
+def _vector_pattern(data, min_win, max_win, vac_budget):
+    nights_all = data.nights
+    keep_clusters = data.cluster_ends - data.cluster_starts + 1 >= 2
+    c_starts = data.cluster_starts[keep_clusters]
+    c_ends = data.cluster_ends[keep_clusters]
+    rank, start, end, length = _anchored_windows(c_starts, min_win, max_win, data.n, 3)
+    j = end + 1
+    vac = data.window(data.work, start, j)
+    cs, ce = c_starts[rank], c_ends[rank]
+    cover_start = np.maximum(start, cs)
+    cover_end = np.minimum(end, ce)
+    coverage = np.where(
+        cover_start <= cover_end,
+        nights_all[np.maximum(cover_end + 1, cover_start)] - nights_all[cover_start],
+        0,
+    )
+    ok = (vac <= vac_budget) & (vac > 0) & (coverage > 0)
+    start, j, length, vac = start[ok], j[ok], length[ok], vac[ok]
+    coverage, cluster_len = coverage[ok], (ce - cs + 1)[ok]
+    nights = data.window(nights_all, start, j)
+    efficiency = (length - vac) / length
+    score = (
+        (length * 1.5 + coverage * 3 + nights * 2)
+        / np.maximum(1, vac)
+        * (1 + efficiency)
+    )
+    return {
+        "start": start, "end": j - 1, "len": length, "used": vac, "score": score,
+        "unit": rank[ok], "reason": (coverage, cluster_len),
+    }
+
+
+# Versión vectorizada de cada estrategia del registro
+_VECTOR_GRID = {
+    "max_consecutive": _vector_max_consecutive,
+    "minimize_work_loss": _vector_minimize_work_loss,
+    "bridge_optimization": _vector_bridge,
+    "seasonal_optimization": _vector_seasonal,
+}
+_VECTOR_ANCHORED = {
+    "holiday_optimization": _vector_holiday,
+    "pattern_analysis": _vector_pattern,
+}
+
+
+def has_vectorized(strategies) -> bool:
+    """True si todas las estrategias tienen versión vectorizada"""
+    return all(
+        s.name in _VECTOR_GRID or s.name in _VECTOR_ANCHORED for s in strategies
+    )
+
+
+def vectorized_suggestions(
+    features: DayFeatures,
+    vacation_calculation: str,
+    vac_budget: int,
+    min_win: int,
+    max_win: int,
+    strategies=None,
+    meta: dict | None = None,
+    limit: int = SUGGESTION_LIMIT,
+    per_strategy: int = PER_STRATEGY_LIMIT,
+) -> list[dict]:
+    """
+    Versión vectorizada de las estrategias de /api/suggest.
+
+    Devuelve las mismas sugerencias que el motor clásico: el deduplicado por
+    (inicio, fin) en orden de generación, con su alternativa de otra
+    estrategia cuando empata, ordenado por (score, largo) descendente y luego
+    por orden de generación, con máximo `per_strategy` sugerencias por
+    estrategia.
+    """
+    if strategies is None:
+        strategies = resolve_strategies()
+    names = [s.name for s in strategies]
+    for name in names:
+        if name not in _VECTOR_GRID and name not in _VECTOR_ANCHORED:
+            raise ValueError(f"La estrategia {name} no tiene versión vectorizada")
+
+    data = _VectorData(features, vacation_calculation)
+    if data.n == 0 or min_win > max_win:
+        return []
+
+    grid = _grid(data, min_win, max_win)
+    by_strategy = []
+    for name in names:
+        started = time.perf_counter()
+        if name in _VECTOR_GRID:
+            cand = _VECTOR_GRID[name](data, *grid, vac_budget)
+            windows = len(cand["start"])
+        else:
+            cand = _VECTOR_ANCHORED[name](data, min_win, max_win, vac_budget)
+            # Ventanas (inicio, largo) distintas, como las cuenta el motor clásico
+            windows = len(np.unique(cand["start"] * (max_win + 1) + cand["len"]))
+        _record(meta, name, started, windows)
+        by_strategy.append((name, cand))
+
+    # Todos los candidatos con su posición en el orden de generación clásico
+    strategy = np.concatenate(
+        [np.full(len(c["start"]), s_idx) for s_idx, (_, c) in enumerate(by_strategy)]
+    )
+    if len(strategy) == 0:
+        return []
+    local = np.concatenate([np.arange(len(c["start"])) for _, c in by_strategy])
+    start = np.concatenate([c["start"] for _, c in by_strategy]).astype(np.int64)
+    end = np.concatenate([c["end"] for _, c in by_strategy])
+    win_len = np.concatenate([c["len"] for _, c in by_strategy]).astype(np.int64)
+    unit = np.concatenate([c["unit"] for _, c in by_strategy]).astype(np.int64)
+    score = np.round(np.concatenate([c["score"] for _, c in by_strategy]), 2)
+    rank = np.array([_STRATEGY_RANK[name] for name, _ in by_strategy])[strategy]
+    n1 = data.n + 1
+    position = ((rank * n1 + unit) * (max_win + 1) + win_len) * n1 + start
+
+    # Deduplicado por (inicio, fin) en orden de generación, como en
+    # SuggestionCollector._window_entries: por ventana, el primero que alcanza
+    # el mejor score y, si otra estrategia empató al que iba primero, el
+    # último de esos empates como alternativa
+    key = start * data.n + end
+    order = np.lexsort((position, key))
+    key_sorted = key[order]
+    first = np.r_[True, key_sorted[1:] != key_sorted[:-1]]
+    last = np.r_[key_sorted[1:] != key_sorted[:-1], True]
+    group = np.cumsum(first) - 1
+    # Score como rango denso para acumular el máximo dentro de cada ventana
+    level = np.unique(score, return_inverse=True)[1].reshape(-1)[order].astype(np.int64)
+    shift = group * (level.max() + 1)
+    running = np.maximum.accumulate(level + shift) - shift
+    before = np.r_[-1, running[:-1]]
+    leads = first | (level > before)
+    leader = np.maximum.accumulate(np.where(leads, np.arange(len(order)), -1))
+    leader_before = np.r_[0, leader[:-1]]
+    ties = np.flatnonzero(
+        ~first
+        & (level == before)
+        & (strategy[order] != strategy[order][leader_before])
+    )
+    tie_group = group[ties]
+    change = tie_group[1:] != tie_group[:-1]
+    tie_first = ties[np.r_[True, change][: len(ties)]]
+    tie_last = ties[np.r_[change, True][: len(ties)]]
+    survivors = np.concatenate((order[leader[last]], order[tie_last]))
+    survivor_position = np.concatenate((position[order][first], position[order][tie_first]))
+
+    # Orden final: score y largo descendentes, luego posición
+    ranked = survivors[
+        np.lexsort(
+            (
+                survivor_position,
+                -win_len[survivors],
+                -score[survivors],
+            )
+        )
+    ]
+
+    # Diversidad: las primeras `per_strategy` de cada estrategia, luego el corte
+    picked = np.concatenate(
+        [
+            np.flatnonzero(strategy[ranked] == s_idx)[:per_strategy]
+            for s_idx in range(len(by_strategy))
+        ]
+    )
+    chosen = ranked[np.sort(picked)[:limit]]
+
+    results = []
+    for idx in chosen:
+        name, cand = by_strategy[strategy[idx]]
+        k = local[idx]
+        s, e = int(cand["start"][k]), int(cand["end"][k])
+        reason = tuple(
+            float(v[k]) if np.asarray(v).dtype.kind == "f" else int(v[k])
+            for v in cand["reason"]
+        )
+        results.append(
+            {
+                "start": features.dates[s],
+                "end": features.dates[e],
+                "len": int(cand["len"][k]),
+                "used": int(cand["used"][k]),
+                "holCount": int(data.window(data.hol, s, e + 1)),
+                "irrCount": int(data.window(data.irr, s, e + 1)),
+                "score": round(float(cand["score"][k]), 2),
+                "strategy": name,
+                "ai_reason": _reason_text(name, reason),
+            }
+        )
+    return results
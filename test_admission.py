@@ -0,0 +1,137 @@
+"""
+Pruebas del control de admisión por costo de /api/suggest, su variante en
+streaming y el lote de empresas: rechazo sobre el límite duro y motor
+vectorizado o con plazo sobre el límite blando.
+"""
+
+import json
+
+import pytest
+
+import app as app_module
+
+REQUEST = {
+    "start": "2025-01-01",
+    "end": "2025-06-30",
+    "patternStart": "2025-01-01",
+    "pattern": "D,D,L,L,N,N",
+    "vacBudget": 10,
+    "minWin": 3,
+    "maxWin": 10,
+}
+BATCH = {
+    "start": REQUEST["start"],
+    "end": REQUEST["end"],
+    "minWin": REQUEST["minWin"],
+    "maxWin": REQUEST["maxWin"],
+    "employees": [
+        {"id": 1, "pattern": "D,D,L,L,N,N", "patternStart": "2025-01-01", "vacBudget": 10},
+        {"id": 2, "pattern": "N,N,L,L", "patternStart": "2025-01-03", "vacBudget": 5},
+    ],
+}
+
+
+@pytest.fixture
+def client():
+    return app_module.app.test_client()
+
+
+@pytest.fixture
+def company(login):
+    client = app_module.app.test_client()
+    login(client, "empresa-admision@example.com", "company")
+    return client
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    """Fija los límites de costo de la app durante la prueba"""
+
+    def set_limits(soft, vector, hard=10**12):
+        monkeypatch.setitem(app_module.app.config, "SUGGEST_COST_SOFT_LIMIT", soft)
+        monkeypatch.setitem(app_module.app.config, "SUGGEST_COST_VECTOR_LIMIT", vector)
+        monkeypatch.setitem(app_module.app.config, "SUGGEST_COST_HARD_LIMIT", hard)
+
+    return set_limits
+
+
+def stream_events(response) -> list[dict]:
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+def test_over_hard_limit_is_rejected(client, company, limits):
+    """Sobre el límite duro los tres endpoints responden 422 con el costo"""
+    limits(0, 0, hard=1)
+    for response in (
+        client.post("/api/suggest", json=REQUEST),
+        client.post("/api/suggest/stream", json=REQUEST),
+        company.post("/api/company/suggest/batch", json=BATCH),
+    ):
+        assert response.status_code == 422
+        body = response.get_json()
+        assert body["maxCost"] == 1
+        assert body["cost"] == int(response.headers["X-Suggest-Cost"]) > 1
+
+
+@pytest.fixture
+def no_cache(suggestion_cache, monkeypatch):
+    """Sin cache: cada request se calcula con el motor que toque"""
+    monkeypatch.setattr(suggestion_cache, "max_entries", 0)
+
+
+def test_over_soft_limit_uses_vectorized_engine(client, company, limits, no_cache):
+    """Entre el límite blando y el vectorizado el resultado es el completo"""
+    expected = client.post("/api/suggest", json=REQUEST).get_json()
+    assert expected["meta"]["engine"] == "classic"
+    assert expected["meta"]["degraded"] is False
+    assert expected["suggestions"]
+    expected_batch = company.post("/api/company/suggest/batch", json=BATCH).get_json()
+
+    limits(0, 10**12)
+    body = client.post("/api/suggest", json=REQUEST).get_json()
+    assert body["meta"]["engine"] == "vectorized"
+    assert body["meta"]["degraded"] is True
+    assert "partial" not in body
+    assert body["suggestions"] == expected["suggestions"]
+
+    events = stream_events(client.post("/api/suggest/stream", json=REQUEST))
+    assert [event["type"] for event in events] == ["final"]
+    assert events[0]["meta"]["engine"] == "vectorized"
+    assert events[0]["meta"]["degraded"] is True
+    assert events[0]["suggestions"] == expected["suggestions"]
+
+    batch = company.post("/api/company/suggest/batch", json=BATCH).get_json()
+    assert batch["meta"]["degraded"] is True
+    assert batch["meta"]["partial"] == 0
+    assert batch["results"] == expected_batch["results"]
+
+
+def test_over_vector_limit_uses_deadline_mode(
+    client, company, limits, no_cache, monkeypatch
+):
+    """Sobre el límite vectorizado se calcula con plazo y se informa la cobertura"""
+    limits(0, 0)
+    monkeypatch.setitem(app_module.app.config, "SUGGEST_DEGRADED_DEADLINE_MS", 60_000)
+    body = client.post("/api/suggest", json=REQUEST).get_json()
+    assert body["meta"]["engine"] == "classic"
+    assert body["meta"]["degraded"] is True
+    assert body["partial"] is False
+    assert body["coverage"]["ratio"] == 1
+
+    # Con el plazo vencido al llegar igual hay respuesta, marcada como parcial
+    monkeypatch.setitem(app_module.app.config, "SUGGEST_DEGRADED_DEADLINE_MS", 0)
+    body = client.post("/api/suggest", json=REQUEST).get_json()
+    assert body["partial"] is True
+    assert 0 < body["coverage"]["ratio"] < 1
+    assert body["suggestions"]
+
+    events = stream_events(client.post("/api/suggest/stream", json=REQUEST))
+    assert [event["type"] for event in events] == ["final"]
+    assert events[0]["meta"]["degraded"] is True
+    assert events[0]["partial"] is True
+    assert "coverage" in events[0]
+
+    batch = company.post("/api/company/suggest/batch", json=BATCH).get_json()
+    assert batch["meta"]["degraded"] is True
+    assert batch["meta"]["partial"] == len(BATCH["employees"])
+    assert all(result["partial"] for result in batch["results"])
@@ -0,0 +1,76 @@
+"""
+Pruebas de /api/company/suggest/batch.
+"""
+
+import pytest
+
+import app as app_module
+
+BATCH = {
+    "start": "2025-04-01",
+    "end": "2025-11-30",
+    "minWin": 4,
+    "maxWin": 10,
+    "employees": [
+        {"id": "a", "pattern": "D,D,L,L,N,N", "patternStart": "2025-04-01", "vacBudget": 10},
+        {"id": "b", "pattern": "N,N,L,L", "patternStart": "2025-04-02", "vacBudget": 6},
+        # Mismo calendario que "a" (un ciclo antes) y mismo cupo
+        {"id": "c", "pattern": "D,D,L,L,N,N", "patternStart": "2025-03-26", "vacBudget": 10},
+        # Mismo calendario que "a" con otro cupo
+        {"id": "d", "pattern": "D,D,L,L,N,N", "patternStart": "2025-04-01", "vacBudget": 3},
+    ],
+}
+
+
+@pytest.fixture
+def company(login):
+    client = app_module.app.test_client()
+    login(client, "empresa-lote@example.com", "company")
+    return client
+
+
+def single_request(emp: dict) -> dict:
+    """Request de /api/suggest equivalente a un empleado del lote"""
+    return dict(
+        {key: BATCH[key] for key in ("start", "end", "minWin", "maxWin")},
+        pattern=emp["pattern"],
+        patternStart=emp["patternStart"],
+        vacBudget=emp["vacBudget"],
+    )
+
+
+def test_batch_groups_employees_and_matches_single_requests(company):
+    client = app_module.app.test_client()
+    expected = [
+        client.post("/api/suggest", json=single_request(emp)).get_json()["suggestions"]
+        for emp in BATCH["employees"]
+    ]
+    app_module.suggestion_cache.clear()
+
+    body = company.post("/api/company/suggest/batch", json=BATCH).get_json()
+    assert body["meta"]["employees"] == 4
+    assert body["meta"]["groups"] == 3
+    assert (body["meta"]["computed"], body["meta"]["cached"]) == (3, 0)
+    assert [result["id"] for result in body["results"]] == ["a", "b", "c", "d"]
+    assert [result["suggestions"] for result in body["results"]] == expected
+
+    # El lote y /api/suggest comparten cache
+    again = company.post("/api/company/suggest/batch", json=BATCH).get_json()
+    assert (again["meta"]["computed"], again["meta"]["cached"]) == (0, 3)
+    assert again["results"] == body["results"]
+    single = client.post("/api/suggest", json=single_request(BATCH["employees"][1]))
+    assert single.get_json()["meta"]["cached"] is True
+
+
+def test_batch_requires_company_user_and_valid_employees(company, login):
+    individual = app_module.app.test_client()
+    login(individual, "persona-lote@example.com")
+    response = individual.post("/api/company/suggest/batch", json=BATCH)
+    assert response.status_code == 403
+
+    response = company.post(
+        "/api/company/suggest/batch",
+        json=dict(BATCH, employees=[{"id": "x", "pattern": "D,L"}]),
+    )
+    assert response.status_code == 400
+    assert "patternStart" in response.get_json()["error"]
@@ -0,0 +1,69 @@
+"""
+Pruebas de /api/build: formatos compactos del calendario y resumen.
+"""
+
+import random
+from datetime import date, timedelta
+
+import app as app_module
+
+
+def random_build_request(rnd: random.Random) -> dict:
+    start = date(2025, 1, 1) + timedelta(days=rnd.randint(0, 500))
+    end = start + timedelta(days=rnd.randint(0, 200))
+    return {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "patternStart": (start + timedelta(days=rnd.randint(-30, 30))).isoformat(),
+        "pattern": ",".join(rnd.choice("DLN") for _ in range(rnd.randint(1, 8))),
+        "overrides": {
+            (start + timedelta(days=rnd.randint(0, 200))).isoformat(): rnd.choice("DLN")
+            for _ in range(rnd.randint(0, 4))
+        },
+    }
+
+
+def test_build_formats_match_day_list():
+    """Los formatos columnar y rle describen el mismo calendario que la lista por día"""
+    client = app_module.app.test_client()
+    rnd = random.Random(11)
+    for _ in range(20):
+        req = random_build_request(rnd)
+        days = client.post("/api/build", json=req).get_json()
+        kinds = [day["kind"] for day in days["schedule"]]
+        start = date.fromisoformat(req["start"])
+        assert [day["date"] for day in days["schedule"]] == [
+            (start + timedelta(days=k)).isoformat() for k in range(len(kinds))
+        ]
+
+        columnar = client.post("/api/build", json=dict(req, format="columnar")).get_json()
+        assert columnar["schedule"]["start"] == req["start"]
+        assert list(columnar["schedule"]["kinds"]) == kinds
+
+        rle = client.post("/api/build", json=dict(req, format="rle")).get_json()
+        assert rle["schedule"]["start"] == req["start"]
+        assert [
+            kind for kind, count in rle["schedule"]["runs"] for _ in range(count)
+        ] == kinds
+
+
+def test_build_summary_matches_day_scan():
+    """El resumen en forma cerrada coincide con contar día por día"""
+    client = app_module.app.test_client()
+    rnd = random.Random(12)
+    for _ in range(20):
+        req = random_build_request(rnd)
+        days = client.post("/api/build", json=req).get_json()
+        kinds = [day["kind"] for day in days["schedule"]]
+        hols = days["holidays"]
+        expected = {kind: kinds.count(kind) for kind in "LDN"}
+        expected["H"] = len(hols)
+        expected["Irr"] = sum(
+            1 for hs in hols.values() if any(h["irrenunciable"] for h in hs)
+        )
+        expected["Loc"] = sum(
+            1
+            for hs in hols.values()
+            if any(h["scope"].startswith(("regional", "local")) for h in hs)
+        )
+        assert days["summary"] == expected, req
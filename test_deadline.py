@@ -0,0 +1,48 @@
+"""
+Pruebas del modo con plazo de /api/suggest (deadline_suggestions).
+"""
+
+import math
+
+import app as app_module
+from suggestion_engine import (
+    DayFeatures,
+    SuggestionContext,
+    classic_suggestions,
+    deadline_suggestions,
+)
+
+REQUESTS = [
+    ("2025-01-01", "2025-12-31", "D,D,L,L,N,N", 10, 3, 10),
+    ("2025-06-01", "2026-03-31", "N,N,L,L", 5, 2, 6),
+    ("2026-02-01", "2026-10-31", "D,D,D,D,D,L,L", 15, 5, 14),
+]
+
+
+def build_context(start, end, pattern, vac_budget, min_win, max_win):
+    sched = app_module.build_schedule(start, end, start, pattern)
+    features = DayFeatures(
+        sched, app_module.holidays_by_date(start, end, "nacional+electoral")
+    )
+    return SuggestionContext(features, "traditional", vac_budget, min_win, max_win)
+
+
+def test_deadline_mode_without_deadline_matches_classic():
+    for req in REQUESTS:
+        ctx = build_context(*req)
+        results, coverage = deadline_suggestions(ctx, math.inf)
+        assert results == classic_suggestions(ctx), req
+        assert coverage["partial"] is False
+        assert coverage["ratio"] == 1
+
+
+def test_deadline_mode_returns_suggestions_with_tiny_deadline():
+    """Con el plazo ya vencido igual se evalúa lo más prometedor"""
+    for req in REQUESTS:
+        ctx = build_context(*req)
+        results, coverage = deadline_suggestions(ctx, 0.0)
+        assert results, req
+        assert coverage["partial"] is True
+        assert 0 < coverage["ratio"] < 1
+        # Al menos una unidad de cada estrategia
+        assert all(ratio > 0 for ratio in coverage["strategies"].values())
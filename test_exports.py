@@ -0,0 +1,40 @@
+"""
+Pruebas de la exportación CSV.
+"""
+
+import csv
+import io
+
+import app as app_module
+
+REQUEST = {
+    "start": "2025-09-01",
+    "end": "2025-10-15",
+    "patternStart": "2025-09-01",
+    "pattern": "D,D,L,L,N,N",
+}
+
+
+def test_csv_holidays_come_from_holiday_index():
+    """Los feriados del CSV son los de /api/build, aunque el cliente mande otros"""
+    client = app_module.app.test_client()
+    built = client.post("/api/build", json=REQUEST).get_json()
+    response = client.post(
+        "/api/export_csv",
+        json={
+            "schedule": built["schedule"],
+            "holidays": {"2025-09-02": [{"name": "Inventado"}]},
+            "vacations": ["2025-09-16", "2025-09-17"],
+        },
+    )
+    assert response.status_code == 200
+    rows = list(csv.reader(io.StringIO(response.get_data(as_text=True))))[1:]
+    assert [row[0] for row in rows] == [day["date"] for day in built["schedule"]]
+    names = {row[0]: row[3] for row in rows if row[3]}
+    assert names == {
+        day: ", ".join(h["name"] for h in hols)
+        for day, hols in built["holidays"].items()
+    }
+    assert "2025-09-18" in names
+    assert [row[0] for row in rows if row[4] == "Sí"] == ["2025-09-16", "2025-09-17"]
+
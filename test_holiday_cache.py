@@ -0,0 +1,91 @@
+"""
+Pruebas de HolidayCache: descarga única por año, cache negativo y datos
+guardados en la base de datos.
+"""
+
+import threading
+
+import holiday_cache as cache_module
+from holiday_cache import HolidayCache
+
+HOLIDAYS = [{"date": "2030-01-01", "name": "Año Nuevo"}]
+
+
+class FakeClock:
+    def __init__(self, monkeypatch):
+        self.now = 1_000_000.0
+        monkeypatch.setattr(cache_module.time, "time", lambda: self.now)
+
+
+def test_concurrent_lookups_share_one_download():
+    release = threading.Event()
+    calls, stored = [], []
+
+    def fetch(year):
+        calls.append(year)
+        release.wait(5)
+        return HOLIDAYS
+
+    cache = HolidayCache(fetch, store=lambda year, hs: stored.append(year))
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get(2030)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    # Nadie esperó a la red y hubo una sola descarga
+    assert results == [None] * 8
+    assert calls == [2030]
+
+    release.set()
+    cache.wait(2030, 5)
+    assert cache.get(2030) == HOLIDAYS
+    assert calls == [2030]
+    assert stored == [2030]
+
+
+def test_failed_download_is_cached_negatively(monkeypatch):
+    clock = FakeClock(monkeypatch)
+    calls = []
+
+    def fetch(year):
+        calls.append(year)
+        return []
+
+    cache = HolidayCache(fetch, ttl=3600, negative_ttl=60)
+    assert cache.get(2031) is None
+    cache.wait(2031, 5)
+    assert cache.get(2031) is None
+    assert calls == [2031]
+
+    clock.now += 61
+    assert cache.get(2031) is None
+    cache.wait(2031, 5)
+    assert calls == [2031, 2031]
+
+
+def test_stored_years_are_served_and_refreshed_when_stale(monkeypatch):
+    clock = FakeClock(monkeypatch)
+    fresh = [{"date": "2032-01-01", "name": "Año Nuevo"}]
+    calls = []
+
+    def fetch(year):
+        calls.append(year)
+        return fresh if year == 2032 else []
+
+    stale = [{"date": "2033-01-01", "name": "Año Nuevo (viejo)"}]
+    stored = {2032: (fresh, clock.now - 10), 2033: (stale, clock.now - 7200)}
+    cache = HolidayCache(fetch, load=stored.get, ttl=3600, negative_ttl=60)
+
+    # Vigente en la base: sin descarga
+    assert cache.get(2032) == fresh
+    # Vencido: se responde con lo guardado y se refresca en segundo plano;
+    # si la descarga falla se siguen usando los datos vencidos
+    assert cache.get(2033) == stale
+    cache.wait(2033, 5)
+    assert calls == [2033]
+    assert cache.get(2033) == stale
+    assert calls == [2033]
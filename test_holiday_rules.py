@@ -0,0 +1,42 @@
+"""
+Pruebas de los feriados calculados por reglas (holiday_rules).
+"""
+
+import app as app_module
+from holiday_rules import chile_holidays
+
+
+def test_chile_holidays_match_official_years():
+    """Feriados nacionales de años con calendario oficial conocido"""
+    official = {
+        2023: [
+            "2023-01-01", "2023-01-02", "2023-04-07", "2023-04-08", "2023-05-01",
+            "2023-05-21", "2023-06-21", "2023-06-26", "2023-07-16", "2023-08-15",
+            "2023-09-18", "2023-09-19", "2023-10-09", "2023-10-27", "2023-11-01",
+            "2023-12-08", "2023-12-25",
+        ],
+        2024: [
+            "2024-01-01", "2024-03-29", "2024-03-30", "2024-05-01", "2024-05-21",
+            "2024-06-20", "2024-06-29", "2024-07-16", "2024-08-15", "2024-09-18",
+            "2024-09-19", "2024-09-20", "2024-10-12", "2024-10-31", "2024-11-01",
+            "2024-12-08", "2024-12-25",
+        ],
+    }
+    for year, dates in official.items():
+        national = [h["date"] for h in chile_holidays(year) if h["scope"] == "nacional"]
+        assert national == dates, year
+
+    # Respaldo local de 2025 (sin los feriados electorales)
+    expected = sorted(
+        h["date"] for h in app_module.HOLIDAYS_2025 if h["scope"] != "electoral"
+    )
+    assert sorted(h["date"] for h in chile_holidays(2025)) == expected
+
+    dates = {h["date"] for y in (2029, 2030) for h in chile_holidays(y)}
+    assert {"2029-09-17", "2030-09-20"} <= dates
+    assert not any("Indígenas" in h["name"] for h in chile_holidays(2020))
+
+
+def test_chile_holidays_are_memoized():
+    """Cada año se calcula una sola vez"""
+    assert chile_holidays(2031) is chile_holidays(2031)
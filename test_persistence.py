@@ -0,0 +1,93 @@
+"""
+Pruebas del historial de sugerencias en ai_suggestions: sobrevive al cache en
+memoria, pasa al historial aunque la respuesta venga del cache y no repite
+filas por huella.
+"""
+
+import pytest
+
+import app as app_module
+from database import AISuggestion, db
+from migrations import migrate_ai_suggestions
+from suggestion_cache import SuggestionCache
+
+REQUEST = {
+    "start": "2025-08-01",
+    "end": "2025-12-31",
+    "patternStart": "2025-08-01",
+    "pattern": "D,D,D,D,D,L,L",
+    "vacBudget": 8,
+    "minWin": 4,
+    "maxWin": 9,
+}
+
+
+@pytest.fixture
+def clients(login):
+    """Dos usuarios con sesión, cada uno con su cliente"""
+    first, second = app_module.app.test_client(), app_module.app.test_client()
+    ids = (
+        login(first, "historial-1@example.com"),
+        login(second, "historial-2@example.com"),
+    )
+    return (first, second), ids
+
+
+def stored_rows(user_id: int) -> list[tuple]:
+    with app_module.app.app_context():
+        return [
+            (row.fingerprint, row.rank)
+            for row in AISuggestion.query.filter_by(user_id=user_id).all()
+        ]
+
+
+def restart_cache(monkeypatch):
+    """Cache vacío, como tras un reinicio del proceso"""
+    monkeypatch.setattr(app_module, "suggestion_cache", SuggestionCache(256, 600))
+
+
+def test_history_survives_cache_and_covers_cache_hits(clients, monkeypatch):
+    (first, second), (first_id, second_id) = clients
+    computed = first.post("/api/suggest", json=REQUEST).get_json()
+    assert computed["meta"]["cached"] is False
+    assert len(stored_rows(first_id)) == len(computed["suggestions"])
+
+    # El segundo usuario recibe lo del cache y también queda en su historial
+    cached = second.post("/api/suggest", json=REQUEST).get_json()
+    assert cached["meta"]["cached"] is True
+    assert len(stored_rows(second_id)) == len(computed["suggestions"])
+
+    for client in (first, second):
+        restart_cache(monkeypatch)
+        body = client.post("/api/suggest", json=REQUEST).get_json()
+        assert body["meta"] == {"engine": "classic", "cached": True, "stored": True}
+        assert body["suggestions"] == computed["suggestions"]
+
+    # Repetir el request no duplica filas
+    restart_cache(monkeypatch)
+    first.post("/api/suggest/stream", json=REQUEST)
+    rows = stored_rows(first_id)
+    assert len(rows) == len(set(rows)) == len(computed["suggestions"])
+
+
+def test_save_suggestions_keeps_first_copy(clients):
+    _, (user_id, _) = clients
+    suggestion = {
+        "start": "2025-09-15",
+        "end": "2025-09-21",
+        "len": 7,
+        "used": 3,
+        "holCount": 2,
+        "irrCount": 1,
+        "score": 9.5,
+        "strategy": "holiday_optimization",
+        "ai_reason": "Fiestas Patrias",
+    }
+    with app_module.app.app_context():
+        app_module.save_suggestions(user_id, "f" * 64, [suggestion])
+        # La segunda copia choca con el índice único y se descarta
+        app_module.save_suggestions(user_id, "f" * 64, [dict(suggestion, score=1.0)])
+        assert app_module.stored_suggestions(user_id, "f" * 64) == [suggestion]
+        # La sesión sigue usable tras el rollback
+        assert AISuggestion.query.filter_by(user_id=user_id).count() >= 1
+    assert migrate_ai_suggestions() is True
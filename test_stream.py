@@ -0,0 +1,70 @@
+"""
+Pruebas de /api/suggest/stream en NDJSON y SSE.
+"""
+
+import json
+
+import app as app_module
+from suggestion_engine import STRATEGY_REGISTRY
+
+REQUEST = {
+    "start": "2025-01-01",
+    "end": "2025-12-31",
+    "patternStart": "2025-01-01",
+    "pattern": "N,N,L,L",
+    "vacBudget": 12,
+    "minWin": 3,
+    "maxWin": 12,
+}
+
+
+def test_ndjson_stream_sends_each_strategy_then_final_ranking():
+    client = app_module.app.test_client()
+    expected = client.post("/api/suggest", json=REQUEST).get_json()["suggestions"]
+    app_module.suggestion_cache.clear()
+
+    response = client.post("/api/suggest/stream", json=REQUEST)
+    assert response.mimetype == "application/x-ndjson"
+    events = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+    *strategies, final = events
+    assert [event["type"] for event in strategies] == ["strategy"] * len(STRATEGY_REGISTRY)
+    assert {event["strategy"] for event in strategies} == set(STRATEGY_REGISTRY)
+    assert final["type"] == "final"
+    assert final["meta"]["cached"] is False
+
+    # El final es el mismo ranking de /api/suggest, hecho con lo ya enviado
+    assert final["suggestions"] == expected
+    sent = {event["strategy"]: event["suggestions"] for event in strategies}
+    for suggestion in final["suggestions"]:
+        assert suggestion in sent[suggestion["strategy"]]
+
+    # Repetido, sale del cache en un solo evento
+    events = client.post("/api/suggest/stream", json=REQUEST).get_data(as_text=True)
+    cached = [json.loads(line) for line in events.splitlines()]
+    assert [event["type"] for event in cached] == ["final"]
+    assert cached[0]["meta"]["cached"] is True
+    assert cached[0]["suggestions"] == expected
+
+
+def test_sse_stream_frames_events():
+    client = app_module.app.test_client()
+    response = client.post(
+        "/api/suggest/stream",
+        json=dict(REQUEST, strategies=["holiday_optimization", "max_consecutive"]),
+        headers={"Accept": "text/event-stream"},
+    )
+    assert response.mimetype == "text/event-stream"
+    frames = response.get_data(as_text=True).split("\n\n")
+    assert frames[-1] == ""
+    events = []
+    for frame in frames[:-1]:
+        event_line, data_line = frame.split("\n")
+        event = json.loads(data_line.removeprefix("data: "))
+        assert event_line == f"event: {event['type']}"
+        events.append(event)
+    assert [event["type"] for event in events] == ["strategy", "strategy", "final"]
+    assert all(
+        s["strategy"] in ("holiday_optimization", "max_consecutive")
+        for s in events[-1]["suggestions"]
+    )
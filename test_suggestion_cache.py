@@ -0,0 +1,72 @@
+"""
+Pruebas del cache de sugerencias: LRU con TTL en memoria, nivel SQLite
+compartido y huella normalizada de /api/suggest.
+"""
+
+import app as app_module
+import suggestion_cache as cache_module
+from suggestion_cache import SuggestionCache
+
+REQUEST = {
+    "start": "2025-03-01",
+    "end": "2025-09-30",
+    "patternStart": "2025-03-01",
+    "pattern": "D,D,L,L,N,N",
+    "vacBudget": 10,
+    "minWin": 4,
+    "maxWin": 10,
+}
+
+
+def test_memory_tier_is_lru_with_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+    cache = SuggestionCache(max_entries=2, ttl=60)
+    cache.set("a", [1])
+    cache.set("b", [2])
+    assert cache.get("a") == [1]
+    # "b" es la menos usada y sale al entrar "c"
+    cache.set("c", [3])
+    assert cache.get("b") is None
+    assert cache.get("c") == [3]
+
+    now[0] += 61
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["stores"]) == (2, 2, 3)
+    assert stats["entries"] == 1
+
+
+def test_sqlite_tier_is_shared_between_processes(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "suggest-cache.db")
+    writer = SuggestionCache(8, 60, db_path)
+    reader = SuggestionCache(8, 60, db_path)
+    writer.set("key", [{"start": "2025-09-15"}])
+    assert reader.get("key") == [{"start": "2025-09-15"}]
+    assert reader.stats()["disk_hits"] == 1
+
+    # Lo vencido en disco tampoco se devuelve
+    later = cache_module.time.time() + 61
+    monkeypatch.setattr(cache_module.time, "time", lambda: later)
+    assert SuggestionCache(8, 60, db_path).get("key") is None
+
+
+def test_fingerprint_ignores_engine_and_pattern_phase():
+    client = app_module.app.test_client()
+    first = client.post("/api/suggest", json=REQUEST).get_json()
+    assert first["meta"]["cached"] is False
+
+    # Otro motor y el patrón empezado un ciclo antes: mismo calendario
+    same = dict(REQUEST, engine="vectorized", patternStart="2025-02-23")
+    body = client.post("/api/suggest", json=same).get_json()
+    assert body["meta"]["cached"] is True
+    assert body["suggestions"] == first["suggestions"]
+
+    # Un override fuera del rango no cambia el resultado; uno dentro sí
+    outside = dict(REQUEST, overrides={"2026-01-05": "L"})
+    assert client.post("/api/suggest", json=outside).get_json()["meta"]["cached"] is True
+    inside = dict(REQUEST, overrides={"2025-05-05": "L"})
+    assert client.post("/api/suggest", json=inside).get_json()["meta"]["cached"] is False
+
+    stats = client.get("/api/suggest/cache").get_json()
+    assert (stats["hits"], stats["misses"]) == (2, 2)
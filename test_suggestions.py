@@ -0,0 +1,135 @@
+"""
+Pruebas del motor de sugerencias: los cuatro motores entre sí y contra el
+ranking de la versión original.
+
+Se ejecutan con pytest y no necesitan red: los rangos caen en 2025/2026,
+cuyos feriados están en el respaldo local.
+"""
+
+import json
+import math
+import os
+import random
+from datetime import date, timedelta
+
+import pytest
+
+os.environ.setdefault("HOLIDAY_WARMUP", "0")
+
+import app as app_module  # noqa: E402
+from suggestion_engine import (  # noqa: E402
+    DayFeatures,
+    SuggestionContext,
+    classic_suggestions,
+    deadline_suggestions,
+    parallel_suggestions,
+    pattern_period,
+    vectorized_suggestions,
+)
+
+PATTERNS = ["D,D,L,L,N,N", "N,N,L,L", "D,D,D,D,L,L,L", "D,D,D,D,D,L,L", "N,L", "L"]
+CALCULATIONS = ["traditional", "shift-based", "all-days"]
+SCOPE = "nacional+electoral"
+# Respuestas de /api/suggest de la versión original (commit 834238d)
+GOLDEN = os.path.join(os.path.dirname(__file__), "golden_suggestions.json")
+
+
+def random_request(rnd: random.Random) -> dict:
+    """Request de sugerencias al azar dentro de 2025/2026"""
+    start = date(2025, 1, 1) + timedelta(days=rnd.randint(0, 400))
+    end = start + timedelta(days=rnd.randint(20, 300))
+    overrides = {
+        (start + timedelta(days=rnd.randint(0, 60))).isoformat(): rnd.choice("LDN")
+        for _ in range(rnd.randint(0, 3))
+    }
+    min_win = rnd.randint(1, 8)
+    return {
+        "start": start.isoformat(),
+        "end": min(end, date(2026, 12, 31)).isoformat(),
+        "patternStart": (start - timedelta(days=rnd.randint(0, 10))).isoformat(),
+        "pattern": rnd.choice(PATTERNS),
+        "overrides": overrides,
+        "vacBudget": rnd.randint(1, 20),
+        "minWin": min_win,
+        "maxWin": min_win + rnd.randint(0, 12),
+    }
+
+
+def build_features(req: dict) -> DayFeatures:
+    sched = app_module.build_schedule(
+        req["start"],
+        req["end"],
+        req["patternStart"],
+        req["pattern"],
+        overrides=req["overrides"],
+    )
+    return DayFeatures(sched, app_module.holidays_by_date(req["start"], req["end"], SCOPE))
+
+
+def test_engines_agree_on_random_schedules():
+    """Clásico, vectorizado, paralelo y con plazo infinito dan lo mismo"""
+    rnd = random.Random(2024)
+    for _ in range(8):
+        req = random_request(rnd)
+        features = build_features(req)
+        period = pattern_period(len(app_module.expand_pattern(req["pattern"])))
+        for calculation in CALCULATIONS:
+            ctx = SuggestionContext(
+                features,
+                calculation,
+                req["vacBudget"],
+                req["minWin"],
+                req["maxWin"],
+                period,
+            )
+            metas = [{}, {}, {}, {}]
+            classic = classic_suggestions(ctx, meta=metas[0])
+            vectorized = vectorized_suggestions(
+                features,
+                calculation,
+                req["vacBudget"],
+                req["minWin"],
+                req["maxWin"],
+                meta=metas[1],
+            )
+            parallel = parallel_suggestions(ctx, pool_size=2, min_work=0, meta=metas[2])
+            deadline, coverage = deadline_suggestions(ctx, math.inf, meta=metas[3])
+
+            assert vectorized == classic, (req, calculation)
+            assert parallel == classic, (req, calculation)
+            assert deadline == classic, (req, calculation)
+            assert coverage["partial"] is False
+            # Los cuatro motores cuentan las mismas ventanas por estrategia
+            counts = [
+                {name: entry["candidates"] for name, entry in meta.items()}
+                for meta in metas
+            ]
+            assert counts[1:] == counts[:1] * 3, (req, calculation)
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"engine": "classic"},
+        {"engine": "vectorized"},
+        {"engine": "parallel"},
+        {"engine": "classic", "deadlineMs": 10**9},
+    ],
+    ids=["classic", "vectorized", "parallel", "deadline"],
+)
+def test_suggest_matches_original_ranking(options, monkeypatch):
+    """/api/suggest devuelve el mismo ranking que la versión original, con sus empates"""
+    # Cada caso con el motor pedido: sin desvío por costo y con el pool siempre
+    config = app_module.app.config
+    monkeypatch.setitem(config, "SUGGEST_COST_SOFT_LIMIT", config["SUGGEST_COST_HARD_LIMIT"])
+    monkeypatch.setitem(config, "SUGGEST_POOL_SIZE", 2)
+    monkeypatch.setitem(config, "SUGGEST_PARALLEL_MIN_WORK", 0)
+    with open(GOLDEN, encoding="utf-8") as f:
+        golden = json.load(f)
+    client = app_module.app.test_client()
+    for case in golden:
+        body = client.post("/api/suggest", json=dict(case["request"], **options)).get_json()
+        assert body["meta"]["engine"] == options["engine"]
+        assert body["meta"]["cached"] is False
+        assert body.get("partial", False) is False
+        assert body["suggestions"] == case["suggestions"], case["request"]
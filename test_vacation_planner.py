@@ -0,0 +1,79 @@
+"""
+Pruebas del planificador anual de vacaciones (vacation_planner.optimal_plan).
+"""
+
+import random
+from datetime import date, timedelta
+from functools import lru_cache
+
+from suggestion_engine import DayFeatures, WindowStats
+from vacation_planner import optimal_plan
+
+CALCULATIONS = ["traditional", "shift-based", "all-days"]
+
+
+def random_features(rnd: random.Random, n: int) -> DayFeatures:
+    first = date(2025, 3, 1) + timedelta(days=rnd.randint(0, 6))
+    sched = [
+        {"date": (first + timedelta(days=d)).isoformat(), "kind": rnd.choice("LDN")}
+        for d in range(n)
+    ]
+    hols = {
+        sched[d]["date"]: [{"irrenunciable": False, "scope": "nacional"}]
+        for d in rnd.sample(range(n), rnd.randint(0, 2))
+    }
+    return DayFeatures(sched, hols)
+
+
+def test_optimal_plan_matches_brute_force():
+    """El plan óptimo coincide con la búsqueda exhaustiva en rangos pequeños"""
+    rnd = random.Random(1)
+    for _ in range(40):
+        n = rnd.randint(8, 24)
+        features = random_features(rnd, n)
+        calculation = rnd.choice(CALCULATIONS)
+        stats = WindowStats(features, calculation)
+        work = [stats.vac_needed(d, d + 1) > 0 for d in range(n)]
+        min_win, max_win = rnd.randint(1, 4), rnd.randint(4, 7)
+        budget = rnd.randint(0, 8)
+        windows = [
+            (i, length, stats.vac_needed(i, i + length))
+            for i in range(n)
+            for length in range(min_win, max_win + 1)
+            if i + length <= n and stats.vac_needed(i, i + length) > 0
+        ]
+
+        # Mejor (días, -vacaciones) con al menos un día de trabajo entre ventanas
+        @lru_cache(maxsize=None)
+        def best_from(prev_end: int, left: int) -> tuple[int, int]:
+            best = (0, 0)
+            for i, length, cost in windows:
+                if cost > left or i < prev_end:
+                    continue
+                if prev_end > 0 and not any(work[prev_end:i]):
+                    continue
+                days, neg_used = best_from(i + length, left - cost)
+                best = max(best, (days + length, neg_used - cost))
+            return best
+
+        total, neg_used = best_from(0, budget)
+        plan = optimal_plan(features, calculation, budget, min_win, max_win)
+        assert (plan["totalDays"], plan["used"]) == (total, -neg_used)
+        assert plan["remaining"] == budget - plan["used"]
+        # Las ventanas del plan caben en el cupo, suman el total y entre dos
+        # seguidas hay un día de trabajo
+        assert sum(w["len"] for w in plan["windows"]) == total
+        assert sum(w["used"] for w in plan["windows"]) <= budget
+        index = {day: d for d, day in enumerate(features.dates)}
+        spans = [(index[w["start"]], index[w["end"]] + 1) for w in plan["windows"]]
+        for (_, prev_end), (next_start, _) in zip(spans, spans[1:]):
+            assert any(work[prev_end:next_start])
+
+
+def test_remaining_counts_requested_budget():
+    """El cupo sobrante se calcula sobre lo pedido, aunque supere los días del rango"""
+    features = random_features(random.Random(3), 10)
+    plan = optimal_plan(features, "all-days", 30, 2, 4)
+    assert plan["used"] <= 10
+    assert plan["remaining"] == 30 - plan["used"]
+    assert optimal_plan(features, "all-days", -5, 2, 4)["remaining"] == 0
@@ -0,0 +1,72 @@
+"""
+Pruebas de la precarga de feriados al arrancar y de /health.
+"""
+
+import threading
+import time
+
+import pytest
+
+import app as app_module
+from holiday_cache import HolidayCache
+
+API_HOLIDAYS = [
+    {"date": "2030-01-01", "name": "Año Nuevo", "irrenunciable": True, "scope": "nacional"}
+]
+
+
+@pytest.fixture
+def not_ready(monkeypatch):
+    """Proceso recién iniciado: feriados sin precargar"""
+    ready = threading.Event()
+    monkeypatch.setattr(app_module, "holidays_ready", ready)
+    monkeypatch.setattr(app_module, "_holiday_indexes", {})
+    return ready
+
+
+def use_api(monkeypatch, fetch):
+    monkeypatch.setattr(app_module, "holiday_cache", HolidayCache(fetch))
+
+
+def test_health_is_503_until_warm_up_finishes(not_ready, monkeypatch):
+    use_api(monkeypatch, lambda year: API_HOLIDAYS if year == 2030 else [])
+    client = app_module.app.test_client()
+    response = client.get("/health")
+    assert response.status_code == 503
+    assert response.get_json()["status"] == "warming_up"
+
+    app_module.warm_up_holidays(2029, 2030, timeout=5)
+    assert not_ready.is_set()
+    assert client.get("/health").status_code == 200
+    # Los años quedan indexados, con lo descargado de la API si llegó a tiempo
+    assert {(2029, "nacional+electoral"), (2030, "nacional+electoral")} <= set(
+        app_module._holiday_indexes
+    )
+    assert app_module.fetch_year_holidays(2030) == (API_HOLIDAYS, "api")
+    assert app_module.fetch_year_holidays(2029)[1] == "local-fallback"
+
+
+def test_warm_up_gives_up_on_slow_api_after_timeout(not_ready, monkeypatch):
+    release = threading.Event()
+    use_api(monkeypatch, lambda year: release.wait(5) and API_HOLIDAYS)
+    started = time.monotonic()
+    app_module.warm_up_holidays(2030, 2030, timeout=0.2)
+    assert time.monotonic() - started < 2
+    assert not_ready.is_set()
+    assert app_module.fetch_year_holidays(2030)[1] == "local-fallback"
+    release.set()
+
+
+def test_warm_up_errors_and_disabled_warm_up_still_mark_ready(not_ready, monkeypatch):
+    def broken(year):
+        raise RuntimeError("sin feriados")
+
+    monkeypatch.setattr(app_module, "fetch_year_holidays", broken)
+    app_module.warm_up_holidays(2025, 2026, timeout=1)
+    assert not_ready.is_set()
+
+    ready = threading.Event()
+    monkeypatch.setattr(app_module, "holidays_ready", ready)
+    monkeypatch.setitem(app_module.app.config, "HOLIDAY_WARMUP", False)
+    app_module.start_holiday_warmup()
+    assert ready.is_set()
@@ -0,0 +1,110 @@
+"""
+Planificador anual de vacaciones.
+
+Reparte el cupo de vacaciones en varias ventanas sin traslape que maximizan
+el total de días fuera del trabajo. Es una mochila sobre los días del rango:
+f[i][b] es el máximo de días de descanso usando solo días desde i con b días
+de vacaciones, y cada ventana (inicio, largo) aporta su largo con costo igual
+a los días de vacaciones que consume.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from suggestion_engine import DayFeatures, WindowStats
+
+
+def _window_costs(stats: WindowStats, n: int, min_win: int, max_win: int):
+    """Costo de cada ventana completa: costs[i][k] para largo min_win + k"""
+    costs = []
+    for i in range(n):
+        row = []
+        for length in range(min_win, max_win + 1):
+            if i + length > n:
+                break
+            row.append(stats.vac_needed(i, i + length))
+        costs.append(row)
+    return costs
+
+
+def _next_work(stats: WindowStats, n: int) -> list[int]:
+    """next_work[j]: primer día desde j que consume vacaciones (n si no hay)"""
+    next_work = [n] * (n + 1)
+    for d in range(n - 1, -1, -1):
+        next_work[d] = d if stats.vac_needed(d, d + 1) > 0 else next_work[d + 1]
+    return next_work
+
+
+def optimal_plan(
+    features: DayFeatures,
+    vacation_calculation: str,
+    vac_budget: int,
+    min_win: int,
+    max_win: int,
+) -> dict:
+    """
+    Mejor conjunto de ventanas sin traslape dentro del cupo.
+
+    Entre dos ventanas queda al menos un día de trabajo (uno que consume
+    vacaciones): si solo las separaran días libres serían un solo descanso
+    más largo que maxWin. Entre planes con el mismo total de días se elige el
+    que usa menos vacaciones. O(días * largos) operaciones vectorizadas sobre
+    el cupo.
+    """
+    stats = WindowStats(features, vacation_calculation)
+    n = features.n
+    # Nunca se usan más vacaciones que días tiene el rango
+    budget = min(max(0, vac_budget), n)
+    min_win = max(1, min_win)
+    costs = _window_costs(stats, n, min_win, max_win)
+    next_work = _next_work(stats, n)
+
+    # f[i][b]: días de descanso con ventanas que empiezan en i o después
+    f = np.zeros((n + 2, budget + 1), dtype=np.int64)
+    for i in range(n - 1, -1, -1):
+        row = f[i + 1].copy()
+        for k, cost in enumerate(costs[i]):
+            if cost == 0 or cost > budget:
+                continue
+            length = min_win + k
+            # La siguiente ventana empieza después del primer día de trabajo
+            taken = length + f[next_work[i + length] + 1][: budget + 1 - cost]
+            np.maximum(row[cost:], taken, out=row[cost:])
+        f[i] = row
+
+    # Menor cupo que alcanza el óptimo
+    best = int(f[0][budget])
+    b = int(np.argmax(f[0] == best))
+    used = b
+
+    windows = []
+    i = 0
+    while i < n and f[i][b] > 0:
+        if f[i][b] == f[i + 1][b]:
+            i += 1
+            continue
+        for k, cost in enumerate(costs[i]):
+            length = min_win + k
+            j = i + length
+            if 0 < cost <= b and length + f[next_work[j] + 1][b - cost] == f[i][b]:
+                windows.append(
+                    {
+                        "start": features.dates[i],
+                        "end": features.dates[j - 1],
+                        "len": length,
+                        "used": cost,
+                        "holCount": stats.holidays(i, j),
+                        "irrCount": stats.irrenunciables(i, j),
+                    }
+                )
+                b -= cost
+                i = next_work[j] + 1
+                break
+
+    return {
+        "windows": windows,
+        "totalDays": best,
+        "used": used,
+        "remaining": max(0, vac_budget) - used,
+    }